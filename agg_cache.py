@@ -0,0 +1,144 @@
+import os
+import sys
+import copy
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+import filter_index
+
+# --- CONFIGURACIÓN ---
+# Límites configurables por variables de entorno
+AGG_CACHE_MAX_MB = float(os.environ.get("GESTOR_AGG_CACHE_MB", 64))
+AGG_CACHE_MAX_ENTRADAS = int(os.environ.get("GESTOR_AGG_CACHE_ENTRADAS", 256))
+
+
+# --- CLAVES ---
+def normalizar_seleccion(seleccion: dict = None) -> tuple:
+    """
+    Forma canónica de una selección de filtros {columna: valores}:
+    ignora filtros vacíos y el orden de columnas y valores.
+    """
+    if not seleccion:
+        return ()
+    return tuple(sorted(
+        (col, tuple(sorted(map(str, valores))))
+        for col, valores in seleccion.items() if valores
+    ))
+
+def _tamano(resultado) -> int:
+    if isinstance(resultado, (pd.DataFrame, pd.Series)):
+        uso = resultado.memory_usage(deep=True)
+        return int(uso.sum()) if isinstance(uso, pd.Series) else int(uso)
+    if hasattr(resultado, "__dict__"):
+        # Objetos de modelo: se suman sus atributos (DataFrames, dicts, ...)
+        return sys.getsizeof(resultado) + sum(_tamano(v) for v in vars(resultado).values())
+    return sys.getsizeof(resultado)
+
+def clave_memo(df: pd.DataFrame, seleccion: dict, nombre: str, args: tuple):
+    """
+    Clave de memo: (huella del DataFrame, selección normalizada, función, args).
+    La huella (filter_index.clave_cache: archivo, largo e índice de filas) evita
+    que una selección que no corresponde al df reciba el resultado de otra.
+    None si el DataFrame no trae df.attrs["file_hash"].
+    """
+    huella = filter_index.clave_cache(df)
+    if huella is None:
+        return None
+    return (huella, normalizar_seleccion(seleccion), nombre, args)
+
+def _copia(resultado):
+    # Quien llama puede modificar el resultado: nunca entregar el objeto guardado.
+    # Modelos (ModeloCarga), dicts y listas también se comparten entre sesiones
+    if isinstance(resultado, (pd.DataFrame, pd.Series)):
+        return resultado.copy()
+    return copy.deepcopy(resultado)
+
+
+# --- CACHÉ ---
+class CacheAgregados:
+    """
+    Caché LRU en memoria para resultados de agregaciones, acotada por
+    cantidad de entradas y por MB. Lleva contadores de aciertos/fallos por función.
+    """
+
+    def __init__(self, max_mb: float = AGG_CACHE_MAX_MB, max_entradas: int = AGG_CACHE_MAX_ENTRADAS):
+        self.max_bytes = max_mb * 1024 * 1024
+        self.max_entradas = max_entradas
+        self._datos = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.aciertos = {}
+        self.fallos = {}
+        self.evictados = 0
+
+    def obtener(self, clave: tuple, nombre: str, calcular):
+        with self._lock:
+            if clave in self._datos:
+                self._datos.move_to_end(clave)
+                self.aciertos[nombre] = self.aciertos.get(nombre, 0) + 1
+                return _copia(self._datos[clave][0])
+            self.fallos[nombre] = self.fallos.get(nombre, 0) + 1
+
+        resultado = calcular()
+        tamano = _tamano(resultado)
+        if tamano > self.max_bytes:
+            return resultado
+
+        with self._lock:
+            if clave not in self._datos:
+                self._datos[clave] = (resultado, tamano)
+                self._bytes += tamano
+            while self._datos and (len(self._datos) > self.max_entradas or self._bytes > self.max_bytes):
+                _, (_, t) = self._datos.popitem(last=False)
+                self._bytes -= t
+                self.evictados += 1
+        return _copia(resultado)
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._datos.clear()
+            self._bytes = 0
+
+    def estadisticas(self) -> pd.DataFrame:
+        with self._lock:
+            nombres = sorted(set(self.aciertos) | set(self.fallos))
+            entradas = {}
+            for clave in self._datos:
+                entradas[clave[2]] = entradas.get(clave[2], 0) + 1
+            filas = []
+            for nombre in nombres:
+                a, f = self.aciertos.get(nombre, 0), self.fallos.get(nombre, 0)
+                filas.append({
+                    "Función": nombre, "Aciertos": a, "Fallos": f,
+                    "% Aciertos": round(100 * a / (a + f), 1) if a + f else 0.0,
+                    "Entradas": entradas.get(nombre, 0),
+                })
+        return pd.DataFrame(filas, columns=["Función", "Aciertos", "Fallos", "% Aciertos", "Entradas"])
+
+    def resumen(self) -> dict:
+        with self._lock:
+            return {
+                "Entradas": len(self._datos),
+                "MB": round(self._bytes / (1024 * 1024), 2),
+                "Evictados": self.evictados,
+            }
+
+
+# Instancia del proceso: compartida por todas las sesiones y reruns
+CACHE = CacheAgregados()
+
+
+def memo(func, df: pd.DataFrame, seleccion: dict = None, *args):
+    """
+    Ejecuta func(df, *args) usando la caché de agregados (clave: ver clave_memo).
+    Si el DataFrame no trae df.attrs["file_hash"], calcula sin cachear.
+    """
+    # Las apps definen funciones homónimas en __main__: el archivo las distingue
+    archivo = os.path.splitext(os.path.basename(func.__code__.co_filename))[0]
+    nombre = f"{archivo}.{func.__qualname__}"
+    clave = clave_memo(df, seleccion, nombre, args)
+    if clave is None:
+        return func(df, *args)
+    return CACHE.obtener(clave, nombre, lambda: func(df, *args))
@@ -0,0 +1,56 @@
+"""
+Cálculos del dashboard sin Streamlit: reciben DataFrames ya cargados y
+retornan DataFrames (o dataclasses), así se pueden perfilar, cachear con
+agg_cache.memo o usar desde benchmarks sin levantar la app.
+
+    filtros      - opciones ordenadas y filtros locales (mapa de calor, radar)
+    resumenes    - agregaciones de cada tab (carga diaria, estado de programas...)
+    gestion      - selección del mes para el Puntaje y detalle por programa
+    validaciones - choques de horario y coordinadoras en varias sedes
+    columnar     - motor DuckDB opcional para los resúmenes (GESTOR_MOTOR_ANALITICO)
+
+La matriz mensual (session_cube.CuboSesiones) y el Puntaje
+(workload.ModeloCarga) ya eran módulos sin widgets: se re-exportan aquí.
+"""
+from session_cube import CuboSesiones
+from workload import ModeloCarga, modelo_carga
+
+from analytics.filtros import (
+    FiltrosCalor,
+    filtrar_mapa_calor,
+    filtrar_valores,
+    nombres_mes,
+    opciones_mapa_calor,
+    ordenar_dias,
+    ordenar_meses,
+    valores_ordenados,
+)
+from analytics.gestion import (
+    TODOS_LOS_MESES,
+    CargaMes,
+    columna_alumnos,
+    detalle_programas,
+    preparar_carga,
+)
+from analytics.resumenes import (
+    asignaturas_por_programa,
+    carga_diaria_coordinadoras,
+    conteo_por,
+    dias_criticos,
+    distribucion_dia_semana,
+    estado_programas,
+    evolucion_dia_semana,
+    resumen_calidad_datos,
+    resumen_coordinadoras_semana,
+    resumen_modalidad,
+    resumen_sede,
+    sesiones_por_coordinadora,
+)
+from analytics.validaciones import (
+    RECURSOS,
+    coordinadoras_multisede,
+    detectar_choques_recurso,
+    dias_multiples_coordinadoras,
+    recursos_disponibles,
+)
+from analytics.columnar import MotorColumnar, memo, motor_columnar
@@ -0,0 +1,292 @@
+"""
+Motor columnar opcional para los resúmenes de las pestañas.
+
+Con GESTOR_MOTOR_ANALITICO=duckdb (y duckdb instalado) la planificación
+normalizada se registra una vez por archivo en una base DuckDB en memoria
+y los resúmenes se calculan como consultas SQL: el filtro de la selección
+y el group-by corren dentro de DuckDB, en varios hilos y sin copias
+intermedias de pandas. Sin duckdb, o con el valor por defecto "pandas",
+todo sigue por las funciones de analytics.resumenes.
+
+Los resultados son los mismos DataFrames (columnas, tipos y orden) que
+entregan las versiones pandas: el SQL agrega y pandas solo aplica el orden
+final sobre el resultado ya agregado.
+"""
+import os
+import threading
+import weakref
+import importlib.util
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import agg_cache
+import filter_index
+import utils
+from analytics import resumenes
+
+COL_COORD = resumenes.COL_COORD
+
+# --- CONFIGURACIÓN ---
+# "pandas" (por defecto) o "duckdb"
+MOTOR_ANALITICO = os.environ.get("GESTOR_MOTOR_ANALITICO", "pandas").strip().lower()
+DUCKDB_DISPONIBLE = importlib.util.find_spec("duckdb") is not None
+ACTIVO = MOTOR_ANALITICO == "duckdb" and DUCKDB_DISPONIBLE
+
+# Columnas que se registran (las demás no participan en los resúmenes)
+COLUMNAS_MOTOR = [COL_COORD, "PROGRAMA", "DIAS/FECHAS", "Dia_Semana", "Mes",
+                  "SEDE", "Modalidad_Calc", "PROFESOR", "Duracion_Horas"]
+
+
+def _q(columna: str) -> str:
+    """Identificador SQL entre comillas dobles."""
+    return '"' + columna.replace('"', '""') + '"'
+
+def _registrable(serie: pd.Series) -> bool:
+    # Categorías de texto (ENUM en DuckDB), fechas o números; lo mixto queda fuera
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return all(isinstance(c, str) for c in serie.cat.categories)
+    return pd.api.types.is_datetime64_any_dtype(serie) or pd.api.types.is_float_dtype(serie)
+
+
+class MotorColumnar:
+    """
+    Tabla "sesiones" en una base DuckDB en memoria, construida una vez por
+    archivo. Las categorías de pandas pasan a ENUM (mismo orden), así los
+    ORDER BY reproducen el orden de groupby(observed=True).
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        import duckdb
+
+        columnas = [c for c in COLUMNAS_MOTOR if c in df.columns and _registrable(df[c])]
+        datos = df[columnas].reset_index(drop=True)
+        # Posición de la fila: "first" de pandas es el primer no nulo en ese orden
+        datos["_fila"] = np.arange(len(datos), dtype="int64")
+
+        self.tipos = datos.dtypes
+        self.columnas = set(columnas)
+        self._con = duckdb.connect(":memory:")
+        self._con.register("_base", datos)
+        anio = ', year("DIAS/FECHAS") AS "Año"' if "DIAS/FECHAS" in self.columnas else ""
+        self._con.execute(f"CREATE TABLE sesiones AS SELECT *{anio} FROM _base")
+        self._con.unregister("_base")
+        if anio:
+            self.columnas.add("Año")
+        self._lock = threading.Lock()
+        # Filas por selección normalizada (ver filas)
+        self._conteos = {}
+
+    def soporta(self, seleccion: dict, requeridas) -> bool:
+        """True si la tabla tiene las columnas de la selección y de la consulta."""
+        usadas = {c for c, v in (seleccion or {}).items() if v} | set(requeridas)
+        return usadas <= self.columnas
+
+    def filas(self, seleccion: dict) -> int:
+        """Filas de la tabla que cumplen la selección (una consulta por selección)."""
+        clave = agg_cache.normalizar_seleccion(seleccion)
+        with self._lock:
+            n = self._conteos.get(clave)
+        if n is None:
+            n = int(self.consulta("count(*) AS n", seleccion)["n"].iloc[0])
+            with self._lock:
+                if len(self._conteos) >= 256:
+                    self._conteos.clear()
+                self._conteos[clave] = n
+        return n
+
+    def _where(self, seleccion: dict, extra: list = ()) -> tuple:
+        partes, params = list(extra), []
+        for columna, valores in (seleccion or {}).items():
+            if not valores:
+                continue
+            if columna == "Año":
+                partes.append('list_contains(?, "Año")')
+                params.append([int(v) for v in valores])
+            else:
+                partes.append(f"list_contains(?, CAST({_q(columna)} AS VARCHAR))")
+                params.append([str(v) for v in valores])
+        return (" WHERE " + " AND ".join(partes)) if partes else "", params
+
+    def consulta(self, select: str, seleccion: dict, extra: list = (), resto: str = "", params_extra=()) -> pd.DataFrame:
+        """SELECT ... FROM sesiones [WHERE selección AND extra] resto, como DataFrame."""
+        where, params = self._where(seleccion, extra)
+        sql = f"SELECT {select} FROM sesiones{where} {resto}"
+        # Un cursor por consulta: la conexión se comparte entre sesiones
+        with self._lock:
+            cursor = self._con.cursor()
+        try:
+            return cursor.execute(sql, list(params_extra) + params).df()
+        finally:
+            cursor.close()
+
+    def como_base(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Devuelve a las columnas el tipo de df_base (categorías, datetime64[ns])."""
+        for col in df.columns:
+            if col not in self.tipos.index:
+                continue
+            tipo = self.tipos[col]
+            if isinstance(tipo, pd.CategoricalDtype):
+                df[col] = pd.Categorical(df[col], dtype=tipo)
+            elif pd.api.types.is_datetime64_any_dtype(tipo):
+                df[col] = df[col].astype(tipo)
+        return df
+
+
+# --- REGISTRO POR ARCHIVO ---
+# file_hash -> motor; las entradas caen cuando st.cache_resource suelta el motor
+_MOTORES = weakref.WeakValueDictionary()
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _motor_cacheado(clave: str, _df: pd.DataFrame) -> MotorColumnar:
+    return MotorColumnar(_df)
+
+def motor_columnar(df_base: pd.DataFrame):
+    """
+    Registra df_base en el motor columnar (una vez por archivo) si está activo.
+    Retorna el motor, o None con el motor pandas o sin df.attrs["file_hash"].
+    """
+    clave = filter_index.clave_cache(df_base)
+    if not ACTIVO or clave is None:
+        return None
+    motor = _motor_cacheado(clave, df_base)
+    _MOTORES[df_base.attrs["file_hash"]] = motor
+    return motor
+
+
+# --- CONSULTAS ---
+# Cada una recibe (motor, selección, *args) y replica la función pandas homónima
+def _unir(columna: str) -> str:
+    # Equivale a utils.unir_distintos; se convierte a texto solo lo distinto (NULL si no hay valores)
+    col = _q(columna)
+    return (f"array_to_string(list_sort(CAST(list(DISTINCT {col}) FILTER (WHERE {col} IS NOT NULL)"
+            f" AS VARCHAR[])), ', ')")
+
+def _texto_o_nan(serie: pd.Series) -> pd.Series:
+    return serie.astype(object).where(serie.notna(), np.nan)
+
+def sesiones_por_coordinadora(motor: MotorColumnar, seleccion: dict) -> pd.DataFrame:
+    conteo = motor.consulta(
+        f"{_q(COL_COORD)} AS clave, count(*) AS n", seleccion,
+        [f"{_q(COL_COORD)} IS NOT NULL"], "GROUP BY 1"
+    )
+    # Mismo camino que value_counts de una categoría: todas las categorías y sort_values
+    categorias = motor.tipos[COL_COORD].categories
+    n = pd.Series(conteo["n"].to_numpy(), index=conteo["clave"].astype(str)).reindex(categorias, fill_value=0)
+    serie = pd.Series(n.to_numpy(dtype="int64"), index=pd.CategoricalIndex(categorias, dtype=motor.tipos[COL_COORD], name=COL_COORD), name="count")
+    carga = serie.sort_values(ascending=False).loc[lambda s: s > 0].reset_index()
+    carga.columns = ["Coordinadora", "Sesiones"]
+    return carga
+
+def distribucion_dia_semana(motor: MotorColumnar, seleccion: dict) -> pd.DataFrame:
+    coord, dia = _q(COL_COORD), _q("Dia_Semana")
+    dist = motor.consulta(
+        f"{coord}, {dia}, count(*) AS Cant", seleccion,
+        [f"{coord} IS NOT NULL", f"{dia} IS NOT NULL"], "GROUP BY 1, 2 ORDER BY 1, 2"
+    )
+    return motor.como_base(dist)
+
+def carga_diaria_coordinadoras(motor: MotorColumnar, seleccion: dict) -> pd.DataFrame:
+    coord, fecha, dia = _q(COL_COORD), _q("DIAS/FECHAS"), _q("Dia_Semana")
+    carga = motor.consulta(
+        f"""{coord}, {fecha},
+            count(DISTINCT "PROGRAMA") AS N_Progs,
+            {_unir("PROGRAMA")} AS Programas,
+            min_by({dia}, _fila) FILTER (WHERE {dia} IS NOT NULL) AS Dia""",
+        seleccion, [f"{coord} IS NOT NULL", f"{fecha} IS NOT NULL"], "GROUP BY 1, 2 ORDER BY 1, 2"
+    )
+    carga["Programas"] = _texto_o_nan(carga["Programas"])
+    # "first" de pandas entrega el día como categoría sin orden
+    carga["Dia"] = pd.Categorical(carga["Dia"], categories=motor.tipos["Dia_Semana"].categories, ordered=False)
+    return motor.como_base(carga)
+
+def resumen_coordinadoras_semana(motor: MotorColumnar, seleccion: dict) -> pd.DataFrame:
+    coord = _q(COL_COORD)
+    base = motor.consulta(
+        f"""{coord}, count(DISTINCT "Dia_Semana") AS dias_clase_semana,
+            coalesce({_unir("Modalidad_Calc")}, '') AS Modalidades,
+            coalesce({_unir("PROGRAMA")}, '') AS Programas""",
+        seleccion, [f"{coord} IS NOT NULL"], "GROUP BY 1 ORDER BY 1"
+    )
+    return motor.como_base(base).rename(columns={
+        COL_COORD: "Coordinadora",
+        "dias_clase_semana": "Días Activos (Semana)"
+    })
+
+def evolucion_dia_semana(motor: MotorColumnar, seleccion: dict, programas) -> pd.DataFrame:
+    dia = _q("Dia_Semana")
+    data_g = motor.consulta(
+        f'{dia}, "PROGRAMA", count(*) AS Sesiones', seleccion,
+        [f"{dia} IS NOT NULL", 'list_contains(?, CAST("PROGRAMA" AS VARCHAR))'],
+        "GROUP BY 1, 2 ORDER BY 1, 2", params_extra=[[str(p) for p in programas]]
+    )
+    data_g = motor.como_base(data_g)
+    data_g["Dia_Semana"] = pd.Categorical(data_g["Dia_Semana"], categories=utils.DIAS_ORDEN, ordered=True)
+    return data_g.sort_values("Dia_Semana")
+
+def estado_programas(motor: MotorColumnar, seleccion: dict, hoy: pd.Timestamp, con_horas: bool = True) -> pd.DataFrame:
+    fecha = _q("DIAS/FECHAS")
+    horas = ', coalesce(sum("Duracion_Horas"), 0.0) AS Sum_Horas' if con_horas else ""
+    stats = motor.consulta(
+        f""""PROGRAMA", min({fecha}) AS Inicio, max({fecha}) AS Fin, count({fecha}) AS Sesiones{horas},
+            {_unir(COL_COORD)} AS Coords""",
+        seleccion, ['"PROGRAMA" IS NOT NULL'], "GROUP BY 1 ORDER BY 1"
+    )
+    stats = motor.como_base(stats)
+    for col in ["Inicio", "Fin"]:
+        stats[col] = stats[col].astype(motor.tipos["DIAS/FECHAS"])
+    stats["Coords"] = _texto_o_nan(stats["Coords"])
+
+    # Calcular Avance %
+    stats["% Avance"] = utils.porcentaje_avance(stats["Inicio"], stats["Fin"], hoy)
+    return stats
+
+def _por_grupo(motor: MotorColumnar, seleccion: dict, columna: str) -> pd.DataFrame:
+    grupo = _q(columna)
+    res = motor.consulta(
+        f'{grupo}, count(*) AS Sesiones, count(DISTINCT "PROGRAMA") AS Programas', seleccion,
+        [f"{grupo} IS NOT NULL"], "GROUP BY 1 ORDER BY 1"
+    )
+    return motor.como_base(res).sort_values("Sesiones", ascending=False)
+
+def resumen_modalidad(motor: MotorColumnar, seleccion: dict) -> pd.DataFrame:
+    return _por_grupo(motor, seleccion, "Modalidad_Calc")
+
+def resumen_sede(motor: MotorColumnar, seleccion: dict) -> pd.DataFrame:
+    return _por_grupo(motor, seleccion, "SEDE")
+
+# Función pandas -> (consulta equivalente, columnas que necesita)
+CONSULTAS = {
+    resumenes.sesiones_por_coordinadora: (sesiones_por_coordinadora, [COL_COORD]),
+    resumenes.distribucion_dia_semana: (distribucion_dia_semana, [COL_COORD, "Dia_Semana"]),
+    resumenes.carga_diaria_coordinadoras: (carga_diaria_coordinadoras, [COL_COORD, "DIAS/FECHAS", "PROGRAMA", "Dia_Semana"]),
+    resumenes.resumen_coordinadoras_semana: (resumen_coordinadoras_semana, [COL_COORD, "Dia_Semana", "Modalidad_Calc", "PROGRAMA"]),
+    resumenes.evolucion_dia_semana: (evolucion_dia_semana, ["Dia_Semana", "PROGRAMA"]),
+    resumenes.estado_programas: (estado_programas, ["PROGRAMA", "DIAS/FECHAS", COL_COORD, "Duracion_Horas"]),
+    resumenes.resumen_modalidad: (resumen_modalidad, ["Modalidad_Calc", "PROGRAMA"]),
+    resumenes.resumen_sede: (resumen_sede, ["SEDE", "PROGRAMA"]),
+}
+
+
+# --- PUNTO DE ENTRADA ---
+def memo(func, df: pd.DataFrame, seleccion: dict = None, *args):
+    """
+    Igual que agg_cache.memo(func, df, seleccion, *args): df debe ser df_base
+    filtrado por `seleccion`. Si el archivo está registrado en el motor
+    columnar y func tiene consulta equivalente, el resultado sale de DuckDB
+    (y se guarda en la misma caché de agregados, como "columnar.<func>").
+    """
+    motor = _MOTORES.get(df.attrs.get("file_hash"))
+    consulta, requeridas = CONSULTAS.get(func, (None, ()))
+    if motor is None or consulta is None or df.empty or not motor.soporta(seleccion, requeridas):
+        return agg_cache.memo(func, df, seleccion, *args)
+    nombre = f"columnar.{func.__qualname__}"
+    clave = agg_cache.clave_memo(df, seleccion, nombre, args)
+
+    def calcular():
+        # La consulta solo ve la selección: si df no tiene sus filas, se calcula sobre df
+        if motor.filas(seleccion) != len(df):
+            return func(df, *args)
+        return consulta(motor, seleccion, *args)
+    return agg_cache.CACHE.obtener(clave, nombre, calcular)
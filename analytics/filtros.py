@@ -0,0 +1,71 @@
+"""Filtros locales de los tabs (mapa de calor, distribución semanal) sin widgets."""
+from dataclasses import dataclass
+
+import pandas as pd
+
+import utils
+
+COL_COORD = "COORDINADORA RESPONSABLE"
+
+
+# --- ORDEN DE OPCIONES ---
+def ordenar_meses(meses) -> list:
+    """Nombres de mes en español en orden de calendario (los desconocidos al final)."""
+    return sorted(meses, key=lambda x: utils.MESES.get(utils.quitar_acentos(str(x)).lower(), 99))
+
+def ordenar_dias(dias) -> list:
+    """Días de semana en orden Lunes..Domingo (los desconocidos al final)."""
+    return sorted(dias, key=lambda x: utils.DIAS_ORDEN.index(x) if x in utils.DIAS_ORDEN else 99)
+
+def valores_ordenados(df: pd.DataFrame, columna: str) -> list:
+    """Valores distintos de la columna, ordenados (opciones de un multiselect)."""
+    return sorted(df[columna].unique())
+
+def nombres_mes(fechas: pd.Series, en_espanol: bool = True) -> pd.Series:
+    """Mes de cada fecha como nombre: español (MESES_NOMBRE) o el de pandas en inglés."""
+    return fechas.dt.month.map(utils.MESES_NOMBRE) if en_espanol else fechas.dt.month_name()
+
+def filtrar_valores(df: pd.DataFrame, columna: str, seleccion) -> pd.DataFrame:
+    """Filas cuyo valor en la columna está en la selección. Sin selección = sin filtro."""
+    return df[df[columna].isin(seleccion)] if seleccion else df
+
+
+# --- MAPA DE CALOR (TAB 3) ---
+@dataclass(frozen=True)
+class FiltrosCalor:
+    """Selección de los filtros del mapa de calor. Listas vacías = sin filtro."""
+    meses: tuple = ()
+    dias: tuple = ()
+    sedes: tuple = ()
+    coordinadoras: tuple = ()
+    # (desde, hasta) como datetime.date; se ignora si no trae las dos fechas
+    rango: tuple = ()
+    meses_en_espanol: bool = True
+
+def opciones_mapa_calor(df: pd.DataFrame, meses_en_espanol: bool = True) -> dict:
+    """Opciones de cada filtro del mapa de calor y el rango de fechas por defecto."""
+    meses = nombres_mes(df["DIAS/FECHAS"], meses_en_espanol).unique()
+    return {
+        "meses": ordenar_meses(meses) if meses_en_espanol else sorted(meses),
+        "dias": list(utils.DIAS_ORDEN),
+        "sedes": valores_ordenados(df, "SEDE"),
+        "coordinadoras": valores_ordenados(df, COL_COORD),
+        "rango": (df["DIAS/FECHAS"].min().date(), df["DIAS/FECHAS"].max().date()),
+    }
+
+def filtrar_mapa_calor(df: pd.DataFrame, filtros: FiltrosCalor) -> pd.DataFrame:
+    """Aplica los filtros del mapa de calor con una sola máscara (sin copias intermedias)."""
+    fechas = df["DIAS/FECHAS"]
+    mascara = pd.Series(True, index=df.index)
+    if filtros.meses:
+        mascara &= nombres_mes(fechas, filtros.meses_en_espanol).isin(filtros.meses)
+    if filtros.dias:
+        mascara &= df["Dia_Semana"].isin(filtros.dias)
+    if filtros.sedes:
+        mascara &= df["SEDE"].isin(filtros.sedes)
+    if filtros.coordinadoras:
+        mascara &= df[COL_COORD].isin(filtros.coordinadoras)
+    if len(filtros.rango) == 2:
+        dias = fechas.dt.date
+        mascara &= (dias >= filtros.rango[0]) & (dias <= filtros.rango[1])
+    return df[mascara]
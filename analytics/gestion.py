@@ -0,0 +1,47 @@
+"""Datos del tab Gestión: selección del mes para el Puntaje y tablas de detalle."""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+COL_ALUMNOS = "Nº ALUMNOS"
+TODOS_LOS_MESES = "Todos los meses"
+
+
+@dataclass
+class CargaMes:
+    """Filas del mes elegido listas para workload.modelo_carga."""
+    df: pd.DataFrame
+    col_alumnos: str
+    # True si el archivo no trae columna de alumnos (se asumió 0 = "Por definir")
+    sin_columna_alumnos: bool = False
+
+def columna_alumnos(df: pd.DataFrame):
+    """Columna de número de alumnos: la exacta o la primera que contenga "ALUMNO"."""
+    if COL_ALUMNOS in df.columns:
+        return COL_ALUMNOS
+    return next((c for c in df.columns if "ALUMNO" in c.upper()), None)
+
+def preparar_carga(df_g: pd.DataFrame, mes: str = TODOS_LOS_MESES) -> CargaMes:
+    """
+    Copia de las filas del mes (o de todos) con la columna de alumnos sin nulos.
+    Si el archivo no tiene esa columna, se crea en 0 y se marca en el resultado.
+    """
+    df_carga = df_g.copy() if mes == TODOS_LOS_MESES else df_g[df_g["Mes"] == mes].copy()
+    col_alumnos = columna_alumnos(df_carga)
+    sin_columna = col_alumnos is None
+    if sin_columna:
+        col_alumnos = COL_ALUMNOS
+        df_carga[col_alumnos] = 0
+    # Asumimos que el número de alumnos es constante por programa (se toma el máx.)
+    df_carga[col_alumnos] = df_carga[col_alumnos].fillna(0)
+    return CargaMes(df_carga, col_alumnos, sin_columna)
+
+def detalle_programas(pares: pd.DataFrame, coordinadoras=None) -> pd.DataFrame:
+    """Puntaje por programa (ModeloCarga.pares) con el estado de la matrícula."""
+    detalle = pares.copy()
+    if coordinadoras:
+        detalle = detalle[detalle["COORDINADORA RESPONSABLE"].isin(coordinadoras)]
+    # Marcar visualmente si alumnos es 0
+    detalle["Estado Alumnos"] = np.where(detalle["Alumnos"] == 0, "Por definir", "Ok")
+    return detalle
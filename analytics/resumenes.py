@@ -0,0 +1,133 @@
+"""Resúmenes por tab: agregaciones puras sobre el DataFrame ya filtrado."""
+import pandas as pd
+
+import utils
+
+COL_COORD = "COORDINADORA RESPONSABLE"
+CAMPOS_CALIDAD = ["DIAS/FECHAS", "PROGRAMA", COL_COORD, "Modalidad_Calc", "SEDE", "HORARIO"]
+# Un día con más programas que esto por coordinadora es "crítico" (Tab 1)
+LIMITE_PROGRAMAS_DIA = 2
+
+
+# --- TAB 1: COORDINADORAS ---
+def carga_diaria_coordinadoras(df_f: pd.DataFrame) -> pd.DataFrame:
+    """Programas distintos por coordinadora y día, con la lista de programas y el día de semana."""
+    claves = [COL_COORD, "DIAS/FECHAS"]
+    carga = df_f.groupby(claves, observed=True).agg(
+        N_Progs=("PROGRAMA", "nunique"),
+        Dia=("Dia_Semana", "first")
+    )
+    carga.insert(1, "Programas", utils.unir_distintos(df_f, claves, "PROGRAMA").reindex(carga.index).to_numpy())
+    return carga.reset_index()
+
+def dias_criticos(carga_diaria: pd.DataFrame, limite: int = LIMITE_PROGRAMAS_DIA) -> pd.DataFrame:
+    """Filas de carga_diaria_coordinadoras con más de `limite` programas en el día."""
+    return carga_diaria[carga_diaria["N_Progs"] > limite].copy()
+
+
+# --- TAB 2: COMPARATIVA ---
+def resumen_coordinadoras_semana(df_filtrado: pd.DataFrame) -> pd.DataFrame:
+    if df_filtrado.empty: return pd.DataFrame()
+    cols_req = ["Dia_Semana", "Modalidad_Calc", "PROGRAMA", COL_COORD]
+    if not all(c in df_filtrado.columns for c in cols_req): return pd.DataFrame()
+
+    g = df_filtrado.groupby(COL_COORD, observed=True)
+    base = g.agg(dias_clase_semana=("Dia_Semana", "nunique")).reset_index()
+
+    # Concatenar textos únicos
+    claves = base[COL_COORD]
+    base["Modalidades"] = utils.unir_distintos(df_filtrado, COL_COORD, "Modalidad_Calc").reindex(claves).fillna("").to_numpy()
+    base["Programas"] = utils.unir_distintos(df_filtrado, COL_COORD, "PROGRAMA").reindex(claves).fillna("").to_numpy()
+
+    return base.rename(columns={
+        COL_COORD: "Coordinadora",
+        "dias_clase_semana": "Días Activos (Semana)"
+    })
+
+def sesiones_por_coordinadora(df_f: pd.DataFrame) -> pd.DataFrame:
+    """Total de sesiones por coordinadora (solo las que tienen sesiones), de mayor a menor."""
+    carga = df_f[COL_COORD].value_counts().loc[lambda s: s > 0].reset_index()
+    carga.columns = ["Coordinadora", "Sesiones"]
+    return carga
+
+def distribucion_dia_semana(df_f: pd.DataFrame) -> pd.DataFrame:
+    """Sesiones por (coordinadora, día de semana)."""
+    return df_f.groupby([COL_COORD, "Dia_Semana"], observed=True).size().reset_index(name="Cant")
+
+
+# --- TAB 3: GLOBAL ---
+def evolucion_dia_semana(df_f: pd.DataFrame, programas) -> pd.DataFrame:
+    """Sesiones por día de semana y programa, solo para `programas`, en orden Lunes..Domingo."""
+    df_plot = df_f[df_f["PROGRAMA"].isin(programas)]
+    data_g = df_plot.groupby(["Dia_Semana", "PROGRAMA"], observed=True).size().reset_index(name="Sesiones")
+    data_g["Dia_Semana"] = pd.Categorical(data_g["Dia_Semana"], categories=utils.DIAS_ORDEN, ordered=True)
+    return data_g.sort_values("Dia_Semana")
+
+
+# --- TAB 4: PROGRAMAS ---
+def estado_programas(df_f: pd.DataFrame, hoy: pd.Timestamp, con_horas: bool = True) -> pd.DataFrame:
+    """
+    Inicio, fin, sesiones, coordinadoras y % de avance por programa.
+    hoy llega normalizado al día para que el resultado se pueda cachear;
+    con_horas agrega Sum_Horas (Duracion_Horas sumada).
+    """
+    agregados = {
+        "Inicio": ("DIAS/FECHAS", "min"),
+        "Fin": ("DIAS/FECHAS", "max"),
+        "Sesiones": ("DIAS/FECHAS", "count"),
+    }
+    if con_horas:
+        agregados["Sum_Horas"] = ("Duracion_Horas", "sum")
+    stats = df_f.groupby("PROGRAMA", observed=True).agg(**agregados)
+    stats["Coords"] = utils.unir_distintos(df_f, "PROGRAMA", COL_COORD).reindex(stats.index).to_numpy()
+    stats = stats.reset_index()
+
+    # Calcular Avance %
+    stats["% Avance"] = utils.porcentaje_avance(stats["Inicio"], stats["Fin"], hoy)
+    return stats
+
+def asignaturas_por_programa(df_f: pd.DataFrame) -> pd.DataFrame:
+    """Primera y última sesión de cada (programa, asignatura)."""
+    return df_f.groupby(["PROGRAMA", "ASIGNATURA"], observed=True).agg(
+        Inicio=("DIAS/FECHAS", "min"),
+        Fin=("DIAS/FECHAS", "max")
+    ).reset_index()
+
+
+# --- TAB 5: SEDE Y CALIDAD ---
+def resumen_modalidad(df_f: pd.DataFrame) -> pd.DataFrame:
+    if df_f.empty or "Modalidad_Calc" not in df_f.columns: return pd.DataFrame()
+    return df_f.groupby("Modalidad_Calc", as_index=False, observed=True).agg(
+        Sesiones=("PROGRAMA", "size"), Programas=("PROGRAMA", "nunique")
+    ).sort_values("Sesiones", ascending=False)
+
+def resumen_sede(df_f: pd.DataFrame) -> pd.DataFrame:
+    if df_f.empty or "SEDE" not in df_f.columns: return pd.DataFrame()
+    return df_f.groupby("SEDE", as_index=False, observed=True).agg(
+        Sesiones=("PROGRAMA", "size"), Programas=("PROGRAMA", "nunique")
+    ).sort_values("Sesiones", ascending=False)
+
+def resumen_calidad_datos(df_all: pd.DataFrame) -> pd.DataFrame:
+    """Faltantes (cantidad y %) de los campos clave."""
+    data = []
+    total = len(df_all)
+    if total == 0: return pd.DataFrame()
+    for col in CAMPOS_CALIDAD:
+        if col in df_all.columns:
+            faltantes = df_all[col].isna().sum()
+            data.append({"Campo": col, "Faltantes": faltantes, "%": round((faltantes/total)*100, 1)})
+    return pd.DataFrame(data)
+
+
+# --- GESTIÓN: DISTRIBUCIÓN SEMANAL ---
+def conteo_por(df_f: pd.DataFrame, columna: str, etiqueta: str, orden: list = None) -> pd.DataFrame:
+    """
+    Clases por valor de `columna` como DataFrame [etiqueta, "Clases"].
+    Con `orden` se listan todos esos valores (0 si no hay clases); sin él,
+    solo los presentes, de mayor a menor.
+    """
+    conteo = df_f[columna].value_counts()
+    conteo = conteo.reindex(orden, fill_value=0) if orden is not None else conteo.loc[lambda s: s > 0]
+    conteo = conteo.reset_index()
+    conteo.columns = [etiqueta, "Clases"]
+    return conteo
@@ -0,0 +1,31 @@
+"""Validaciones de la planificación: choques de horario y coordinadoras en varias sedes."""
+import pandas as pd
+
+import conflicts
+
+COL_COORD = "COORDINADORA RESPONSABLE"
+
+# Choques por recurso (Profesor, Sala, Coordinadora, Programa): barrido de conflicts
+detectar_choques_recurso = conflicts.detectar_choques_recurso
+recursos_disponibles = conflicts.recursos_disponibles
+# Etiqueta -> (columnas del recurso, columna de detalle)
+RECURSOS = conflicts.RECURSOS
+
+
+def dias_multiples_coordinadoras(df: pd.DataFrame) -> pd.DataFrame:
+    """Días con clases de más de una coordinadora (mapa de calor del Tab 3)."""
+    choques = df.groupby("DIAS/FECHAS")[COL_COORD].nunique().reset_index(name="N_Coords")
+    return choques[choques["N_Coords"] > 1].copy()
+
+def coordinadoras_multisede(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Coordinadoras con clases en más de una sede, de más a menos sedes.
+    Columnas: Coordinadora, Cantidad_Sedes y Sedes (separadas por coma).
+    """
+    if "SEDE" not in df.columns or COL_COORD not in df.columns:
+        return pd.DataFrame(columns=[COL_COORD, "Cantidad_Sedes", "Sedes"])
+    multi_sede = df.groupby(COL_COORD, observed=True)["SEDE"].unique().reset_index()
+    multi_sede["Cantidad_Sedes"] = multi_sede["SEDE"].apply(len)
+    multi_sede["Sedes"] = multi_sede["SEDE"].apply(lambda x: ", ".join(sorted(x)))
+    multi_sede = multi_sede[multi_sede["Cantidad_Sedes"] > 1].sort_values("Cantidad_Sedes", ascending=False)
+    return multi_sede[[COL_COORD, "Cantidad_Sedes", "Sedes"]]
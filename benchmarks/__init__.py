@@ -0,0 +1,13 @@
+"""
+Benchmark reproducible del dashboard sobre planificaciones sintéticas.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks                          # 1k, 10k, 100k y 1M filas
+    python -m benchmarks --filas 1000 10000 --repeticiones 5
+    python -m benchmarks --filas 1000 --comparar bench_resultados/bench_<commit>_<fecha>.json
+    python -m benchmarks --filas 100000 --memoria # + memoria por columna con/sin categorías
+    python -m benchmarks.reglas 100000            # reglas escalares vs vectorizadas
+
+Los archivos sintéticos se generan una vez por (filas, seed, formato) en
+GESTOR_BENCH_DIR; el reporte queda en bench_resultados/bench_<commit>_<fecha>.json/.csv.
+"""
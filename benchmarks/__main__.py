@@ -0,0 +1,35 @@
+import argparse
+
+from benchmarks import escenarios, sinteticos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de carga y cálculos del dashboard sobre datos sintéticos.")
+    parser.add_argument("--filas", type=int, nargs="+", default=sinteticos.TAMANOS,
+                        help="Tamaños a medir (por defecto: 1k 10k 100k 1M)")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--escenarios", nargs="+", choices=list(escenarios.ESCENARIOS),
+                        help="Subconjunto de escenarios (la carga siempre se mide)")
+    parser.add_argument("--formato", choices=["xlsx", "csv"],
+                        help=f"Formato del archivo sintético (por defecto xlsx hasta {sinteticos.MAX_FILAS_XLSX:,} filas)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--salida", default="bench_resultados", help="Directorio del reporte JSON/CSV")
+    parser.add_argument("--comparar", help="Reporte JSON anterior para comparar tiempos")
+    parser.add_argument("--memoria", action="store_true",
+                        help="Imprime la memoria por columna con y sin tipos categóricos (utils.reporte_memoria)")
+    args = parser.parse_args()
+
+    # El reporte anterior se lee antes de escribir el nuevo
+    anterior = escenarios.leer_reporte(args.comparar) if args.comparar else None
+
+    resultados = escenarios.ejecutar(args.filas, args.repeticiones, args.escenarios, args.formato, args.seed, args.memoria)
+    rutas = escenarios.guardar_reporte(resultados, escenarios.metadatos(), args.salida)
+    print(resultados.to_string(index=False))
+    print("\nReporte: " + ", ".join(rutas))
+
+    if anterior is not None:
+        print(escenarios.comparar(anterior, resultados).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
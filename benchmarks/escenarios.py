@@ -0,0 +1,189 @@
+"""
+Escenarios cronometrados sobre una planificación sintética y reporte
+JSON/CSV comparable entre commits.
+"""
+import os
+import sys
+import json
+import time
+import platform
+import statistics
+import subprocess
+from datetime import datetime
+
+import pandas as pd
+
+import analytics
+from analytics import columnar
+import filter_index
+import session_cube
+import utils
+import workload
+
+from benchmarks import sinteticos
+
+COLUMNAS_REPORTE = ["Escenario", "Filas", "Formato", "Repeticiones", "Seg_Min", "Seg_Mediana", "Filas_Resultado"]
+
+
+# --- ESCENARIOS ---
+def cascada_tab1(df: pd.DataFrame):
+    """
+    Filtros en cascada del Tab 1 sobre un índice nuevo: en cada paso se piden
+    las opciones disponibles y se elige la primera en Año y Coordinadora.
+    """
+    idx = filter_index.IndiceFiltros(df)
+    mascara = None
+    for columna in ["Año", "Mes", "COORDINADORA RESPONSABLE", "PROGRAMA", "SEDE",
+                    "Modalidad_Calc", "PROFESOR", "Dia_Semana"]:
+        opciones = idx.opciones(columna, mascara)
+        if columna in ("Año", "COORDINADORA RESPONSABLE") and opciones:
+            mascara = idx.aplicar(mascara, columna, opciones[:1])
+    return df if mascara is None else df[mascara]
+
+def puntaje(df: pd.DataFrame) -> pd.DataFrame:
+    # Con filas basura sobre el encabezado la columna llega como object
+    df = df.assign(**{"Nº ALUMNOS": pd.to_numeric(df["Nº ALUMNOS"], errors="coerce")})
+    carga = analytics.preparar_carga(df)
+    return workload.ModeloCarga(carga.df, carga.col_alumnos).resumen()
+
+# Motor DuckDB por DataFrame: el registro se mide en su propio escenario
+_MOTORES = {}
+
+def _motor(df: pd.DataFrame) -> columnar.MotorColumnar:
+    if id(df) not in _MOTORES or _MOTORES[id(df)][0] is not df:
+        _MOTORES.clear()
+        _MOTORES[id(df)] = (df, columnar.MotorColumnar(df))
+    return _MOTORES[id(df)][1]
+
+def carga_diaria_duckdb(df: pd.DataFrame) -> pd.DataFrame:
+    """Misma tabla que "carga_diaria", como consulta sobre el motor columnar."""
+    return columnar.carga_diaria_coordinadoras(_motor(df), {})
+
+def estado_programas_duckdb(df: pd.DataFrame) -> pd.DataFrame:
+    return columnar.estado_programas(_motor(df), {}, pd.Timestamp.now().normalize())
+
+# Nombre -> función sobre el DataFrame ya cargado. Ninguna usa las cachés de
+# la app (sin df.attrs["file_hash"]): se mide el cálculo completo cada vez.
+ESCENARIOS = {
+    "cascada_tab1": cascada_tab1,
+    "carga_diaria": analytics.carga_diaria_coordinadoras,
+    "estado_programas": lambda df: analytics.estado_programas(df, pd.Timestamp.now().normalize()),
+    "matriz_gestion": lambda df: session_cube.CuboSesiones(df).matriz(),
+    "puntaje": puntaje,
+    "choques_profesor": lambda df: analytics.detectar_choques_recurso(df, "Profesor"),
+    "excel": utils.generate_excel_report,
+}
+# Con duckdb instalado se comparan los resúmenes pandas contra el motor columnar
+if columnar.DUCKDB_DISPONIBLE:
+    ESCENARIOS.update({
+        "registro_duckdb": columnar.MotorColumnar,
+        "carga_diaria_duckdb": carga_diaria_duckdb,
+        "estado_programas_duckdb": estado_programas_duckdb,
+    })
+
+
+# --- MEDICIÓN ---
+def cronometrar(func, repeticiones: int = 3):
+    """Ejecuta func() `repeticiones` veces. Retorna (tiempos en segundos, último resultado)."""
+    tiempos, resultado = [], None
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        resultado = func()
+        tiempos.append(time.perf_counter() - t0)
+    return tiempos, resultado
+
+def _fila(escenario, n_filas, formato, tiempos, resultado) -> dict:
+    return {
+        "Escenario": escenario, "Filas": n_filas, "Formato": formato,
+        "Repeticiones": len(tiempos),
+        "Seg_Min": round(min(tiempos), 4),
+        "Seg_Mediana": round(statistics.median(tiempos), 4),
+        "Filas_Resultado": len(resultado) if isinstance(resultado, (pd.DataFrame, pd.Series)) else None,
+    }
+
+def _cargar(ruta: str) -> pd.DataFrame:
+    with open(ruta, "rb") as archivo:
+        return utils.load_data(archivo)
+
+def memoria_tipos(df: pd.DataFrame) -> pd.DataFrame:
+    """utils.reporte_memoria de la carga contra la misma tabla con las categorías como object."""
+    categoricas = [c for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)]
+    return utils.reporte_memoria(df.astype({c: object for c in categoricas}), df)
+
+def medir_tamano(n_filas: int, repeticiones: int = 3, escenarios=None, formato: str = None, seed: int = 0,
+                 memoria: bool = False) -> list:
+    """
+    Genera (o reutiliza) el archivo de n_filas, mide la carga y luego cada escenario.
+    Con memoria=True imprime (stderr) el ahorro de memoria de los tipos compactos.
+    """
+    formato = formato or sinteticos.formato_por_defecto(n_filas)
+    ruta = sinteticos.archivo_sintetico(n_filas, seed, formato)
+
+    # La carga de los tamaños grandes se mide una sola vez
+    rep_carga = repeticiones if n_filas <= sinteticos.MAX_FILAS_XLSX else 1
+    tiempos, df = cronometrar(lambda: _cargar(ruta), rep_carga)
+    filas = [_fila("carga", n_filas, formato, tiempos, df)]
+    if memoria:
+        print(memoria_tipos(df).to_string(), file=sys.stderr)
+
+    for nombre in escenarios or ESCENARIOS:
+        tiempos, resultado = cronometrar(lambda: ESCENARIOS[nombre](df), repeticiones)
+        filas.append(_fila(nombre, n_filas, formato, tiempos, resultado))
+    return filas
+
+
+# --- REPORTE ---
+def _commit() -> str:
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=raiz,
+            capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def metadatos() -> dict:
+    """Contexto de la corrida: sin esto dos reportes no son comparables."""
+    return {
+        "commit": _commit(),
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "plataforma": platform.platform(),
+        "cpus": os.cpu_count(),
+        "motor_excel": utils.MOTOR_EXCEL or "openpyxl",
+        "duckdb": columnar.DUCKDB_DISPONIBLE,
+    }
+
+def guardar_reporte(resultados: pd.DataFrame, meta: dict, directorio: str) -> tuple:
+    """Escribe bench_<commit>_<fecha>.json y .csv (con los metadatos en cada fila). Retorna las rutas."""
+    os.makedirs(directorio, exist_ok=True)
+    sello = meta["fecha"].replace(":", "").replace("-", "")
+    base = os.path.join(directorio, f"bench_{meta['commit'] or 'sin_git'}_{sello}")
+    with open(base + ".json", "w", encoding="utf-8") as f:
+        json.dump({"metadatos": meta, "resultados": resultados.to_dict(orient="records")},
+                  f, ensure_ascii=False, indent=2)
+    resultados.assign(**{k: v for k, v in meta.items()}).to_csv(base + ".csv", index=False)
+    return base + ".json", base + ".csv"
+
+def leer_reporte(ruta: str) -> pd.DataFrame:
+    with open(ruta, encoding="utf-8") as f:
+        return pd.DataFrame(json.load(f)["resultados"], columns=COLUMNAS_REPORTE)
+
+def comparar(anterior: pd.DataFrame, actual: pd.DataFrame) -> pd.DataFrame:
+    """Seg_Min por (Escenario, Filas) de dos reportes y la variación porcentual (negativa = más rápido)."""
+    claves = ["Escenario", "Filas"]
+    tabla = anterior[claves + ["Seg_Min"]].merge(
+        actual[claves + ["Seg_Min"]], on=claves, suffixes=("_Antes", "_Ahora")
+    )
+    tabla["Cambio_%"] = (100 * (tabla["Seg_Min_Ahora"] / tabla["Seg_Min_Antes"] - 1)).round(1)
+    return tabla
+
+def ejecutar(tamanos=None, repeticiones: int = 3, escenarios=None, formato: str = None, seed: int = 0,
+             memoria: bool = False) -> pd.DataFrame:
+    filas = []
+    for n in tamanos or sinteticos.TAMANOS:
+        print(f"[bench] {n:,} filas...", file=sys.stderr)
+        filas.extend(medir_tamano(n, repeticiones, escenarios, formato, seed, memoria))
+    return pd.DataFrame(filas, columns=COLUMNAS_REPORTE).astype({"Filas_Resultado": "Int64"})
@@ -0,0 +1,63 @@
+"""
+Micro-benchmark de las reglas de negocio vectorizadas (Factor Alumnos y
+% Avance) contra sus versiones escalares en utils. La paridad se prueba en
+tests/test_reglas.py, con estos mismos datos.
+
+Uso (desde la raíz del repositorio): python -m benchmarks.reglas [n_filas]
+"""
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+import utils
+
+
+def datos_alumnos(n: int, seed: int = 0) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    # Incluye los bordes de cada tramo, 0 ("Por definir"), decimales y nulos
+    bordes = [0, 1, 19, 19.5, 20, 29, 30, 39, 40, 48, 48.9, 49, 50, 120, -3, np.nan]
+    valores = rng.integers(0, 80, n).astype("float64")
+    valores[: len(bordes)] = bordes
+    return pd.Series(valores)
+
+def datos_programas(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    inicio = pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 730, n), "D")
+    fin = inicio + pd.to_timedelta(rng.integers(-5, 400, n), "D")
+    df = pd.DataFrame({"Inicio": inicio, "Fin": fin})
+    # Fechas faltantes y programas de un solo día
+    df.loc[df.index[:n // 50], "Inicio"] = pd.NaT
+    df.loc[df.index[n // 50: n // 25], "Fin"] = df["Inicio"]
+    return df
+
+def medir(n: int) -> pd.DataFrame:
+    alumnos = datos_alumnos(n)
+    stats = datos_programas(n)
+    hoy = pd.Timestamp("2025-09-15")
+    casos = {
+        "Factor_Alumnos": (
+            lambda: alumnos.apply(utils.get_factor_alumnos),
+            lambda: utils.factor_alumnos(alumnos),
+        ),
+        "% Avance": (
+            lambda: stats.apply(lambda r: utils.get_avance(r["Inicio"], r["Fin"], hoy), axis=1),
+            lambda: utils.porcentaje_avance(stats["Inicio"], stats["Fin"], hoy),
+        ),
+    }
+    filas = []
+    for nombre, (escalar, vectorizado) in casos.items():
+        t_esc = min(timeit.repeat(escalar, number=1, repeat=3))
+        t_vec = min(timeit.repeat(vectorizado, number=1, repeat=3))
+        filas.append({
+            "Regla": nombre, "Filas": n,
+            "Escalar_ms": round(t_esc * 1000, 2), "Vectorizado_ms": round(t_vec * 1000, 2),
+            "Aceleración": round(t_esc / t_vec, 1) if t_vec else float("inf"),
+        })
+    return pd.DataFrame(filas)
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(medir(n).to_string(index=False))
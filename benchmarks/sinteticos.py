@@ -0,0 +1,173 @@
+"""
+Generador de planificaciones sintéticas con la forma de los archivos reales:
+filas basura sobre el encabezado, fechas mezcladas (celdas de fecha,
+dd/mm/aaaa y "12 de marzo 2025"), horas en varios formatos y columnas con
+los nombres que busca utils.load_data.
+"""
+import os
+import csv
+import tempfile
+from datetime import time as hora
+
+import numpy as np
+import pandas as pd
+
+import utils
+
+# --- CONFIGURACIÓN ---
+DATOS_DIR = os.environ.get(
+    "GESTOR_BENCH_DIR",
+    os.path.join(tempfile.gettempdir(), "gestor_bench"),
+)
+TAMANOS = [1_000, 10_000, 100_000, 1_000_000]
+# Sobre este tamaño se genera CSV: leer un xlsx de 1M filas con openpyxl toma minutos
+MAX_FILAS_XLSX = 100_000
+
+COORDINADORAS = [
+    "MARCELA ORELLANA", "CECILIA AHUMADA", "KATA HUNTING", "MACARENA CORNEJO",
+    "PAULINA ROJAS", "JAVIERA SOTO", "CAROLINA MUÑOZ", "FERNANDA LAGOS",
+    "ISIDORA PEÑA", "VALENTINA ARAYA", "CONSTANZA VEGA", "MARÍA JOSÉ DÍAZ",
+]
+TIPOS_PROGRAMA = ["MAGISTER EN", "MAGÍSTER EN", "DIPLOMA EN", "DIPLOMADO EN", "MASTER IN"]
+AREAS = [
+    "DIRECCIÓN DE PERSONAS Y ORGANIZACIONES", "GESTIÓN DE NEGOCIOS", "MARKETING",
+    "DIRECCIÓN ESTRATEGICA DE VENTAS", "FINANZAS CORPORATIVAS", "STRATEGIC SOURCING",
+    "INNOVACION Y EMPRENDIMIENTO", "NEGOCIOS SOSTENIBLES", "MANAGEMENT", "DATA SCIENCE",
+]
+VERSIONES = ["2025", "2026", "2025 - 2026 AÑO 2", "2026-2027 1º año", "BL 2025", "EJECUTIVO 2026"]
+SEDES = ["Vitacura", "Peñalolén", "Online", "POR DEFINIR", "Viña del Mar", "Híbrida Vitacura", None]
+MODALIDADES = ["PRESENCIAL", "HIBRIDA", "ONLINE", "EXAMEN", "AYUDANTÍA", None]
+NOMBRES = ["JAIME", "NAISA", "NICOLÁS", "ANDRÉS", "PATRICIO", "SOFÍA", "RODRIGO", "CLAUDIA", "TOMÁS", "IGNACIO"]
+APELLIDOS = ["ACUÑA", "GORMAZ", "HERRERA", "SILVA", "MORALES", "FUENTES", "CASTRO", "REYES", "TAPIA", "VERGARA"]
+BLOQUES = [(9, 0, 13, 30), (14, 30, 18, 0), (17, 0, 21, 30), (18, 30, 22, 0), (8, 30, 12, 45)]
+COLUMNAS = [
+    "PROGRAMA", "Nº ALUMNOS", "AÑO", "SIGLA", "ASIGNATURA", "DIAS/FECHAS",
+    "HORA INICIO", "HORA FIN", "HORARIO", "PROFESOR", "MODALIDAD", "SEDE", "SALA",
+    "COORDINADORA RESPONSABLE",
+]
+FILAS_BASURA = [
+    ["PLANIFICACIÓN ACADÉMICA - ESCUELA DE NEGOCIOS"],
+    [],
+    ["Actualizado por coordinación", "versión sintética"],
+]
+
+
+def _programas(n_programas: int, rng) -> pd.DataFrame:
+    nombres = [
+        f"{rng.choice(TIPOS_PROGRAMA)} {rng.choice(AREAS)} {rng.choice(VERSIONES)} ({i:04d})"
+        for i in range(n_programas)
+    ]
+    return pd.DataFrame({
+        "PROGRAMA": nombres,
+        "COORDINADORA RESPONSABLE": rng.choice(COORDINADORAS, n_programas),
+        "SEDE": rng.choice(np.array(SEDES, dtype=object), n_programas),
+        "MODALIDAD": rng.choice(np.array(MODALIDADES, dtype=object), n_programas, p=[.5, .2, .15, .05, .05, .05]),
+        # Algunos programas sin matrícula aún ("Por definir")
+        "Nº ALUMNOS": np.where(rng.random(n_programas) < 0.1, np.nan, rng.integers(5, 60, n_programas)),
+        "Inicio": pd.Timestamp("2025-03-01") + pd.to_timedelta(rng.integers(0, 540, n_programas), "D"),
+    })
+
+def _fechas_mixtas(fechas: pd.Series, rng, como_texto: bool) -> np.ndarray:
+    """
+    70% fecha nativa (dd-mm-aaaa en CSV, como exporta Excel en es-CL),
+    20% dd/mm/aaaa, 9% "D de mes AAAA" y 1% vacía o ilegible.
+    """
+    sorteo = rng.random(len(fechas))
+    if como_texto:
+        salida = fechas.dt.strftime("%d-%m-%Y").to_numpy(dtype=object)
+    else:
+        salida = fechas.to_numpy(dtype=object)
+    numericas = sorteo >= 0.70
+    salida[numericas] = fechas[numericas].dt.strftime("%d/%m/%Y").to_numpy()
+    textuales = sorteo >= 0.90
+    meses = fechas[textuales].dt.month.map(utils.MESES_NOMBRE).str.lower()
+    salida[textuales] = (fechas[textuales].dt.day.astype(str) + " de " + meses + " "
+                         + fechas[textuales].dt.year.astype(str)).to_numpy()
+    salida[sorteo >= 0.99] = rng.choice(np.array([None, "", "POR CONFIRMAR"], dtype=object), int((sorteo >= 0.99).sum()))
+    return salida
+
+def _horas_mixtas(h: np.ndarray, m: np.ndarray, rng, como_texto: bool) -> np.ndarray:
+    """Horas como "HH:MM", "H:MM:SS", time (solo Excel) y algunas vacías."""
+    sorteo = rng.random(len(h))
+    cortas = np.char.add(np.char.add(np.char.zfill(h.astype(str), 2), ":"), np.char.zfill(m.astype(str), 2))
+    salida = cortas.astype(object)
+    largas = sorteo >= 0.6
+    salida[largas] = np.char.add(np.char.add(np.char.add(h[largas].astype(str), ":"),
+                                             np.char.zfill(m[largas].astype(str), 2)), ":00")
+    if not como_texto:
+        nativas = sorteo >= 0.85
+        salida[nativas] = [hora(int(a), int(b)) for a, b in zip(h[nativas], m[nativas])]
+    salida[sorteo >= 0.98] = None
+    return salida
+
+def generar_planificacion(n_filas: int, seed: int = 0, como_texto: bool = False) -> pd.DataFrame:
+    """DataFrame con n_filas sesiones sintéticas (sin las filas basura del archivo)."""
+    rng = np.random.default_rng(seed)
+    programas = _programas(max(20, min(5_000, n_filas // 40)), rng)
+    idx = rng.integers(0, len(programas), n_filas)
+    prog = programas.iloc[idx].reset_index(drop=True)
+
+    fechas = prog["Inicio"] + pd.to_timedelta(rng.integers(0, 52, n_filas) * 7 + rng.integers(0, 5, n_filas), "D")
+    bloques = np.array(BLOQUES)[rng.integers(0, len(BLOQUES), n_filas)]
+    h_ini, m_ini, h_fin, m_fin = bloques.T
+    profesores = np.char.add(np.char.add(rng.choice(NOMBRES, n_filas), " "), rng.choice(APELLIDOS, n_filas)).astype(object)
+    profesores[rng.random(n_filas) < 0.02] = None
+
+    sigla = np.char.add(rng.choice(["MGT", "PLE", "FIN", "MKT"], n_filas), rng.integers(100, 500, n_filas).astype(str))
+    return pd.DataFrame({
+        "PROGRAMA": prog["PROGRAMA"],
+        "Nº ALUMNOS": prog["Nº ALUMNOS"],
+        "AÑO": fechas.dt.year,
+        "SIGLA": sigla,
+        "ASIGNATURA": "ASIGNATURA " + pd.Series(sigla),
+        "DIAS/FECHAS": _fechas_mixtas(fechas, rng, como_texto),
+        "HORA INICIO": _horas_mixtas(h_ini, m_ini, rng, como_texto),
+        "HORA FIN": _horas_mixtas(h_fin, m_fin, rng, como_texto),
+        "HORARIO": [f"{a:02d}:{b:02d} - {c:02d}:{d:02d}" for a, b, c, d in bloques],
+        "PROFESOR": profesores,
+        "MODALIDAD": prog["MODALIDAD"],
+        "SEDE": prog["SEDE"],
+        "SALA": rng.choice(np.array(["A-101", "B-204", "AULA MAGNA", None], dtype=object), n_filas),
+        "COORDINADORA RESPONSABLE": prog["COORDINADORA RESPONSABLE"],
+    }, columns=COLUMNAS)
+
+def _escribir_xlsx(df: pd.DataFrame, ruta: str) -> None:
+    from openpyxl import Workbook
+
+    libro = Workbook(write_only=True)
+    hoja = libro.create_sheet("Planificación")
+    for fila in FILAS_BASURA:
+        hoja.append(fila)
+    hoja.append(COLUMNAS)
+    valores = df.astype(object).where(df.notna(), None)
+    for fila in valores.itertuples(index=False, name=None):
+        hoja.append(fila)
+    libro.save(ruta)
+
+def _escribir_csv(df: pd.DataFrame, ruta: str) -> None:
+    # Las filas basura llevan todas las comas: read_csv exige el mismo número de campos
+    with open(ruta, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.writer(f)
+        for fila in FILAS_BASURA:
+            escritor.writerow(fila + [""] * (len(COLUMNAS) - len(fila)))
+        escritor.writerow(COLUMNAS)
+    df.to_csv(ruta, mode="a", header=False, index=False, encoding="utf-8")
+
+def formato_por_defecto(n_filas: int) -> str:
+    return "xlsx" if n_filas <= MAX_FILAS_XLSX else "csv"
+
+def archivo_sintetico(n_filas: int, seed: int = 0, formato: str = None, directorio: str = None) -> str:
+    """
+    Ruta de la planificación sintética (n_filas, seed, formato). Se genera una
+    sola vez: con la misma seed el archivo es idéntico entre corridas y commits.
+    """
+    formato = formato or formato_por_defecto(n_filas)
+    directorio = directorio or DATOS_DIR
+    os.makedirs(directorio, exist_ok=True)
+    ruta = os.path.join(directorio, f"planificacion_{n_filas}_s{seed}.{formato}")
+    if not os.path.exists(ruta):
+        df = generar_planificacion(n_filas, seed, como_texto=(formato == "csv"))
+        tmp = ruta + ".tmp"
+        (_escribir_xlsx if formato == "xlsx" else _escribir_csv)(df, tmp)
+        os.replace(tmp, ruta)
+    return ruta
@@ -0,0 +1,168 @@
+import numpy as np
+import pandas as pd
+
+import utils
+
+# --- CONSTANTES ---
+# Valores de PROFESOR que no representan a una persona asignada
+PROFESORES_EXCLUIDOS = {"SIN PROFESOR", "POR DEFINIR", "NAN"}
+# Valores que indican un recurso sin asignar en cualquier columna
+VALORES_VACIOS = {"", "NAN", "NONE", "NAT", "-"}
+# Sedes virtuales (mismo criterio que Modalidad_Calc en utils): no son salas físicas
+SEDES_VIRTUALES = ("ONLINE", "ZOOM")
+
+# Separación entre grupos en la clave (grupo, minuto): mayor que cualquier
+# minuto absoluto desde 1970 (~2.9e7 hoy), así un grupo nunca invade al siguiente
+_MINUTOS_POR_GRUPO = 10**8
+
+
+# --- INTERVALOS ---
+def intervalos_sesiones(df: pd.DataFrame):
+    """
+    Inicio y fin de cada sesión en minutos absolutos (desde 1970), vectorizado.
+    Retorna dos Series float con NaN donde falta la fecha o la hora.
+    """
+    if "HORA_INICIO_MIN" in df.columns and "HORA_FIN_MIN" in df.columns:
+        ini = df["HORA_INICIO_MIN"].astype("float64")
+        fin = df["HORA_FIN_MIN"].astype("float64")
+    else:
+        # DataFrames que no pasaron por la carga: mismo parseo de horas de utils
+        ini = utils.minutos_desde_medianoche(df["HORA_INICIO"]).astype("float64")
+        fin = utils.minutos_desde_medianoche(df["HORA_FIN"]).astype("float64")
+
+    fechas = df["DIAS/FECHAS"]
+    dias = fechas.values.astype("datetime64[D]").astype("int64").astype("float64")
+    dias[fechas.isna().to_numpy()] = np.nan
+    base = pd.Series(dias * 1440, index=df.index)
+    return base + ini, base + fin
+
+
+# --- BARRIDO ---
+def pares_solapados(grupos, inicio, fin):
+    """
+    Barrido ordenado: encuentra TODOS los pares de intervalos del mismo grupo
+    que se solapan (no solo los consecutivos), en O(n log n + nº de pares).
+
+    grupos: códigos enteros >= 0; inicio/fin: minutos enteros. Los
+    intervalos con fin <= inicio se ignoran.
+    Retorna dos arrays (i, j) con posiciones en el orden de entrada.
+    """
+    grupos = np.asarray(grupos, dtype="int64")
+    inicio = np.asarray(inicio, dtype="int64")
+    fin = np.asarray(fin, dtype="int64")
+    vacio = np.array([], dtype="int64")
+    # Sesiones de duración cero o con fin antes del inicio no ocupan el recurso
+    posiciones = np.flatnonzero(fin > inicio)
+    grupos, inicio, fin = grupos[posiciones], inicio[posiciones], fin[posiciones]
+    if len(grupos) < 2:
+        return vacio, vacio
+
+    # Orden por (grupo, inicio, fin)
+    orden = np.lexsort((fin, inicio, grupos))
+    clave_ini = grupos[orden] * _MINUTOS_POR_GRUPO + inicio[orden]
+    clave_fin = grupos[orden] * _MINUTOS_POR_GRUPO + fin[orden]
+
+    # Para cada intervalo i, los siguientes que empiezan antes de que i termine
+    # lo solapan: son exactamente las posiciones (i, k) con k = searchsorted(fin_i)
+    pos = np.arange(len(orden))
+    limite = np.searchsorted(clave_ini, clave_fin, side="left")
+    n_pares = np.clip(limite - pos - 1, 0, None)
+    total = int(n_pares.sum())
+    if total == 0:
+        return vacio, vacio
+
+    i = np.repeat(pos, n_pares)
+    desplaz = np.arange(total) - np.repeat(np.cumsum(n_pares) - n_pares, n_pares)
+    j = i + 1 + desplaz
+    return posiciones[orden[i]], posiciones[orden[j]]
+
+
+# --- RECURSOS ---
+def valores_excluidos(columna: str) -> set:
+    """
+    Marcadores de la columna que no identifican un recurso real: vacíos,
+    "POR DEFINIR" y los rellenos de la carga ("SIN ASIGNAR", "SIN <COLUMNA>").
+    """
+    excluidos = VALORES_VACIOS | {"SIN " + columna, "SIN ASIGNAR", "POR DEFINIR"}
+    return excluidos | PROFESORES_EXCLUIDOS if columna == "PROFESOR" else excluidos
+
+# Recursos validables: etiqueta -> (columnas que identifican el recurso, columna de detalle)
+RECURSOS = {
+    "Profesor": (["PROFESOR"], "PROGRAMA"),
+    "Sala": (["SEDE", "SALA"], "PROGRAMA"),
+    "Coordinadora": (["COORDINADORA RESPONSABLE"], "PROGRAMA"),
+    "Programa": (["PROGRAMA"], "ASIGNATURA"),
+}
+
+COLUMNAS_CHOQUES = ["Recurso", "Fecha", "Detalle_1", "Horario_1",
+                    "Detalle_2", "Horario_2", "Solape_Min", "Fila_1", "Fila_2"]
+
+def recursos_disponibles(df: pd.DataFrame) -> list:
+    """Etiquetas de RECURSOS cuyas columnas existen en el DataFrame."""
+    return [k for k, (cols, _) in RECURSOS.items() if all(c in df.columns for c in cols)]
+
+def detectar_choques(df: pd.DataFrame, columnas, detalle: str = "PROGRAMA") -> pd.DataFrame:
+    """
+    Detecta sesiones del mismo recurso que se solapan en el tiempo.
+    columnas: una columna o lista de columnas que identifican el recurso
+    (ej. ["SEDE", "SALA"]); filas con alguna parte en valores_excluidos se
+    ignoran, y al validar salas también las sesiones en SEDES_VIRTUALES.
+    Retorna un DataFrame con una fila por par en conflicto.
+    """
+    if isinstance(columnas, str):
+        columnas = [columnas]
+    if df.empty or not all(c in df.columns for c in columnas):
+        return pd.DataFrame(columns=COLUMNAS_CHOQUES)
+
+    ini, fin = intervalos_sesiones(df)
+    validas = ini.notna() & fin.notna()
+    partes = []
+    for c in columnas:
+        texto = df[c].astype(str)
+        validas &= df[c].notna() & ~texto.str.strip().str.upper().isin(valores_excluidos(c))
+        partes.append(texto)
+    if "SALA" in columnas and "SEDE" in df.columns:
+        sede = df["SEDE"].astype(str).str.upper()
+        validas &= ~sede.str.contains("|".join(SEDES_VIRTUALES), regex=True)
+    if validas.sum() < 2:
+        return pd.DataFrame(columns=COLUMNAS_CHOQUES)
+
+    recurso = partes[0]
+    for texto in partes[1:]:
+        recurso = recurso + " / " + texto
+
+    sub = df[validas]
+    ini, fin = ini[validas].astype("int64"), fin[validas].astype("int64")
+    codigos = recurso[validas].astype("category").cat.codes.to_numpy()
+
+    i, j = pares_solapados(codigos, ini.to_numpy(), fin.to_numpy())
+    if len(i) == 0:
+        return pd.DataFrame(columns=COLUMNAS_CHOQUES)
+
+    ini_1, fin_1 = ini.iloc[i].reset_index(drop=True), fin.iloc[i].reset_index(drop=True)
+    ini_2, fin_2 = ini.iloc[j].reset_index(drop=True), fin.iloc[j].reset_index(drop=True)
+    hora = lambda s: utils.formatear_minutos(s % 1440)
+    if detalle in sub.columns:
+        det_1 = sub[detalle].iloc[i].astype(str).to_numpy()
+        det_2 = sub[detalle].iloc[j].astype(str).to_numpy()
+    else:
+        det_1 = det_2 = ""
+
+    choques = pd.DataFrame({
+        "Recurso": recurso[validas].iloc[i].to_numpy(),
+        "Fecha": sub["DIAS/FECHAS"].iloc[i].dt.normalize().to_numpy(),
+        "Detalle_1": det_1,
+        "Horario_1": hora(ini_1) + " - " + hora(fin_1),
+        "Detalle_2": det_2,
+        "Horario_2": hora(ini_2) + " - " + hora(fin_2),
+        "Solape_Min": (np.minimum(fin_1, fin_2) - np.maximum(ini_1, ini_2)).astype("int32"),
+        "Fila_1": sub.index[i],
+        "Fila_2": sub.index[j],
+    })
+    choques["Recurso"] = choques["Recurso"].astype("category")
+    return choques.sort_values(["Fecha", "Recurso"], ignore_index=True)
+
+def detectar_choques_recurso(df: pd.DataFrame, etiqueta: str) -> pd.DataFrame:
+    """Atajo para validar uno de los recursos predefinidos en RECURSOS."""
+    columnas, detalle = RECURSOS[etiqueta]
+    return detectar_choques(df, columnas, detalle)
@@ -0,0 +1,148 @@
+import os
+import glob
+import hashlib
+import inspect
+import functools
+
+import pandas as pd
+
+import multi_ingest
+import utils
+
+# --- CONFIGURACIÓN ---
+# Carpeta y tamaño máximo configurables por variables de entorno
+CACHE_DIR = os.environ.get(
+    "GESTOR_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache_datos"),
+)
+CACHE_MAX_MB = float(os.environ.get("GESTOR_CACHE_MAX_MB", 500))
+
+EXTENSIONES = (".parquet", ".pkl")
+
+# Módulos que producen los DataFrames cacheados: load_data (un archivo) y
+# alinear_esquema / cargar_varios (varios archivos u hojas)
+MODULOS_ESQUEMA = (utils, multi_ingest)
+
+
+# --- CLAVES ---
+@functools.lru_cache(maxsize=1)
+def version_load_data() -> str:
+    """
+    Sello de versión del esquema producido por utils.load_data y multi_ingest.
+    Cambia si cambia el código de MODULOS_ESQUEMA o la versión de pandas,
+    invalidando automáticamente las entradas antiguas.
+    """
+    h = hashlib.md5()
+    for modulo in MODULOS_ESQUEMA:
+        h.update(inspect.getsource(modulo).encode("utf-8"))
+    h.update(pd.__version__.encode("utf-8"))
+    return h.hexdigest()[:12]
+
+def clave_cache(file_hash: str) -> str:
+    return f"{file_hash}_{version_load_data()}"
+
+def _rutas(file_hash: str):
+    base = os.path.join(CACHE_DIR, clave_cache(file_hash))
+    return [base + ext for ext in EXTENSIONES]
+
+
+# --- LECTURA / ESCRITURA ---
+def leer(file_hash: str):
+    """Retorna el DataFrame cacheado para ese hash, o None si no existe."""
+    for ruta in _rutas(file_hash):
+        if not os.path.exists(ruta):
+            continue
+        try:
+            if ruta.endswith(".parquet"):
+                df = pd.read_parquet(ruta)
+            else:
+                df = pd.read_pickle(ruta)
+        except Exception as e:
+            # Entrada corrupta: se descarta y se vuelve a procesar el archivo
+            print(f"Warning: caché en disco ilegible ({ruta}): {e}")
+            _borrar(ruta)
+            continue
+        # Marcar como usado recientemente (LRU por mtime)
+        os.utime(ruta, None)
+        return df
+    return None
+
+def guardar(file_hash: str, df: pd.DataFrame) -> None:
+    """
+    Guarda el DataFrame normalizado como Parquet. Si alguna columna tiene
+    tipos mezclados que Parquet no soporta, usa pickle como respaldo.
+    """
+    if df is None or df.empty:
+        return
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    ruta_parquet, ruta_pickle = _rutas(file_hash)
+    try:
+        _escribir_atomico(ruta_parquet, lambda tmp: df.to_parquet(tmp))
+    except Exception:
+        try:
+            _escribir_atomico(ruta_pickle, lambda tmp: df.to_pickle(tmp))
+        except Exception as e:
+            print(f"Warning: no se pudo guardar caché en disco: {e}")
+            return
+    evictar()
+
+def _escribir_atomico(ruta, escribir):
+    # Escribir a un temporal y renombrar, para que otra réplica nunca lea a medias
+    tmp = f"{ruta}.{os.getpid()}.tmp"
+    try:
+        escribir(tmp)
+        os.replace(tmp, ruta)
+    finally:
+        _borrar(tmp)
+
+
+# --- MANTENCIÓN ---
+def _entradas():
+    archivos = []
+    for ext in EXTENSIONES:
+        archivos.extend(glob.glob(os.path.join(CACHE_DIR, "*" + ext)))
+    return archivos
+
+def _borrar(ruta):
+    try:
+        os.remove(ruta)
+    except OSError:
+        pass
+
+def evictar(max_mb: float = None) -> int:
+    """Elimina las entradas menos usadas hasta quedar bajo el límite. Retorna cuántas borró."""
+    limite = (CACHE_MAX_MB if max_mb is None else max_mb) * 1024 * 1024
+    entradas = []
+    for ruta in _entradas():
+        try:
+            info = os.stat(ruta)
+        except OSError:
+            continue
+        entradas.append((info.st_mtime, info.st_size, ruta))
+
+    total = sum(size for _, size, _ in entradas)
+    borradas = 0
+    for _, size, ruta in sorted(entradas):
+        if total <= limite:
+            break
+        _borrar(ruta)
+        total -= size
+        borradas += 1
+    return borradas
+
+def purgar() -> int:
+    """Vacía la caché en disco completa. Retorna cuántas entradas borró."""
+    entradas = _entradas()
+    for ruta in entradas:
+        _borrar(ruta)
+    return len(entradas)
+
+def estadisticas() -> dict:
+    entradas = _entradas()
+    total = 0
+    for ruta in entradas:
+        try:
+            total += os.path.getsize(ruta)
+        except OSError:
+            pass
+    return {"Entradas": len(entradas), "MB": round(total / (1024 * 1024), 2)}
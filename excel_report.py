@@ -0,0 +1,104 @@
+import pandas as pd
+import streamlit as st
+
+import agg_cache
+import analytics
+import conflicts
+import filter_index
+import session_cube
+import utils
+import workload
+
+# --- CONFIGURACIÓN ---
+# Hojas que se pueden sumar al reporte completo (nombre de hoja en el Excel)
+HOJAS_OPCIONALES = ["Puntaje", "Choques", "Matriz_Mensual"]
+
+COLS_HORAS = ["HORA_INICIO_MIN", "HORA_FIN_MIN"]
+
+
+# --- HOJAS ---
+# Cada hoja reutiliza lo que ya calculan las pestañas (agg_cache / cubo), con
+# las mismas claves: si la pestaña ya se abrió, el reporte no recalcula nada.
+def hoja_resumen(df: pd.DataFrame) -> pd.DataFrame:
+    return df.groupby(
+        workload.COL_COORD, observed=True
+    ).size().reset_index(name="Total Clases")
+
+def hoja_puntaje(df: pd.DataFrame) -> pd.DataFrame:
+    """Puntaje por (Coordinadora, Programa) de todos los años y meses, como el tab Gestión por defecto."""
+    col_alumnos = analytics.columna_alumnos(df)
+    columnas = [workload.COL_COORD, workload.COL_PROG, "DIAS/FECHAS"]
+    if not all(c in df.columns for c in columnas) or df.empty:
+        return None
+
+    if col_alumnos:
+        df_carga = df[columnas + [col_alumnos]]
+        df_carga = df_carga.assign(**{col_alumnos: df_carga[col_alumnos].fillna(0)})
+    else:
+        col_alumnos = "Nº ALUMNOS"
+        df_carga = df[columnas].assign(**{col_alumnos: 0})
+
+    anios = filter_index.indice_filtros(df).opciones("Año")
+    modelo = agg_cache.memo(
+        workload.modelo_carga, df_carga,
+        {"Año": anios, "Mes": [analytics.TODOS_LOS_MESES]}, col_alumnos
+    )
+    return modelo.pares.sort_values([workload.COL_COORD, "Puntaje"], ascending=[True, False])
+
+def hoja_choques(df: pd.DataFrame) -> pd.DataFrame:
+    """Choques de horario de todos los recursos validables, con una columna Tipo."""
+    if not all(c in df.columns for c in COLS_HORAS):
+        return None
+    partes = []
+    for recurso in conflicts.recursos_disponibles(df):
+        choques = agg_cache.memo(conflicts.detectar_choques_recurso, df, None, recurso)
+        partes.append(choques.drop(columns=["Fila_1", "Fila_2"]).assign(Tipo=recurso))
+    if not partes:
+        return None
+    choques = pd.concat(partes, ignore_index=True)
+    return choques[["Tipo"] + [c for c in choques.columns if c != "Tipo"]]
+
+def hoja_matriz(df: pd.DataFrame) -> pd.DataFrame:
+    """Matriz mensual de sesiones (Coordinadora, Programa) x Mes de todos los años."""
+    return session_cube.cubo_sesiones(df).matriz().reset_index()
+
+CONSTRUCTORES = {
+    "Puntaje": hoja_puntaje,
+    "Choques": hoja_choques,
+    "Matriz_Mensual": hoja_matriz,
+}
+
+
+# --- REPORTE ---
+def tipo_reporte(extras=()) -> tuple:
+    """Forma canónica de las hojas opcionales pedidas (orden de HOJAS_OPCIONALES)."""
+    return tuple(h for h in HOJAS_OPCIONALES if h in set(extras or ()))
+
+def hojas_reporte(df: pd.DataFrame, extras=()) -> dict:
+    """
+    {nombre de hoja: DataFrame o callable} del reporte completo. Las hojas
+    opcionales quedan como callables: se calculan recién al escribirlas.
+    """
+    hojas = {
+        "Datos_Completos": lambda: utils.datos_exportables(df),
+        "Resumen_Coordinadoras": lambda: hoja_resumen(df),
+    }
+    for nombre in tipo_reporte(extras):
+        hojas[nombre] = lambda f=CONSTRUCTORES[nombre]: f(df)
+    return hojas
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _reporte_cacheado(clave: str, tipo: tuple, _df: pd.DataFrame) -> bytes:
+    return utils.escribir_excel(hojas_reporte(_df, tipo))
+
+def reporte_excel(df: pd.DataFrame, extras=()) -> bytes:
+    """
+    Bytes del reporte Excel (datos completos, resumen y hojas opcionales).
+    Se cachea por (archivo, tipo de reporte): pedir de nuevo la misma
+    descarga no vuelve a escribir el libro.
+    """
+    tipo = tipo_reporte(extras)
+    clave = filter_index.clave_cache(df)
+    if clave is None:
+        return utils.escribir_excel(hojas_reporte(df, tipo))
+    return _reporte_cacheado(clave, tipo, df)
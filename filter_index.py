@@ -0,0 +1,136 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# --- CONFIGURACIÓN ---
+# Columnas filtrables: nombre en el índice -> función que obtiene la Serie desde el DataFrame
+COLUMNAS_FILTRO = {
+    "Año": lambda df: df["DIAS/FECHAS"].dt.year,
+    "Mes": lambda df: df["Mes"],
+    "SEDE": lambda df: df["SEDE"],
+    "Modalidad_Calc": lambda df: df["Modalidad_Calc"],
+    "COORDINADORA RESPONSABLE": lambda df: df["COORDINADORA RESPONSABLE"],
+    "PROGRAMA": lambda df: df["PROGRAMA"],
+    "PROFESOR": lambda df: df["PROFESOR"],
+    "Dia_Semana": lambda df: df["Dia_Semana"],
+}
+
+# Máscaras por (columna, selección) que se guardan por índice
+MAX_MASCARAS = 64
+
+
+class IndiceFiltros:
+    """
+    Índice de filtros construido una vez por archivo cargado.
+    Cada columna se guarda como códigos enteros (posición del valor en la lista
+    ordenada de valores), así las opciones disponibles y las máscaras se
+    calculan con operaciones sobre arrays NumPy, sin copiar DataFrames.
+    """
+
+    def __init__(self, df: pd.DataFrame, columnas: dict = None):
+        self.n = len(df)
+        self.valores = {}
+        self._codigos = {}
+        self._mascaras = {}
+        # El índice se comparte entre sesiones (cache_resource)
+        self._lock = threading.Lock()
+
+        for nombre, obtener in (columnas or COLUMNAS_FILTRO).items():
+            try:
+                serie = obtener(df)
+            except (KeyError, AttributeError):
+                continue
+
+            codigos, uniques = pd.factorize(serie, use_na_sentinel=True)
+            uniques = list(uniques)
+            # Orden natural de Python, igual que sorted(df[col].unique())
+            orden = sorted(range(len(uniques)), key=lambda i: uniques[i])
+            rango = np.empty(len(uniques) + 1, dtype="int64")
+            rango[orden] = np.arange(len(uniques))
+            # Los nulos (-1) quedan en la última posición, fuera de las opciones
+            rango[-1] = len(uniques)
+
+            tipo = np.int16 if len(uniques) < np.iinfo(np.int16).max else np.int32
+            self._codigos[nombre] = rango[codigos].astype(tipo)
+            self.valores[nombre] = [uniques[i] for i in orden]
+
+    def __contains__(self, columna):
+        return columna in self._codigos
+
+    def opciones(self, columna: str, mascara: np.ndarray = None) -> list:
+        """Valores presentes en las filas de la máscara (todas si es None), ya ordenados."""
+        if columna not in self._codigos:
+            return []
+        codigos = self._codigos[columna]
+        if mascara is not None:
+            codigos = codigos[mascara]
+        presentes = np.bincount(codigos, minlength=len(self.valores[columna]) + 1)
+        valores = self.valores[columna]
+        return [valores[i] for i in np.flatnonzero(presentes[:len(valores)])]
+
+    def mascara(self, columna: str, seleccion) -> np.ndarray:
+        """Máscara booleana de las filas cuyo valor en la columna está en la selección."""
+        clave = (columna, tuple(sorted(map(str, seleccion))))
+        with self._lock:
+            if clave in self._mascaras:
+                return self._mascaras[clave]
+
+        valores = self.valores[columna]
+        posicion = {v: i for i, v in enumerate(valores)}
+        tabla = np.zeros(len(valores) + 1, dtype=bool)
+        for v in seleccion:
+            if v in posicion:
+                tabla[posicion[v]] = True
+        resultado = tabla[self._codigos[columna]]
+
+        with self._lock:
+            if len(self._mascaras) >= MAX_MASCARAS:
+                self._mascaras.pop(next(iter(self._mascaras)))
+            self._mascaras[clave] = resultado
+        return resultado
+
+    def aplicar(self, mascara: np.ndarray, columna: str, seleccion) -> np.ndarray:
+        """AND de la máscara actual con el filtro de la columna. Sin selección = sin filtro."""
+        if not seleccion or columna not in self._codigos:
+            return mascara
+        m = self.mascara(columna, seleccion)
+        return m if mascara is None else mascara & m
+
+    def filtrar(self, df: pd.DataFrame, selecciones: dict) -> pd.DataFrame:
+        """Aplica varias selecciones {columna: valores} de una vez sobre el DataFrame indexado."""
+        mascara = None
+        for columna, seleccion in selecciones.items():
+            mascara = self.aplicar(mascara, columna, seleccion)
+        return df if mascara is None else df[mascara]
+
+
+def clave_cache(df: pd.DataFrame):
+    """
+    Clave de caché del DataFrame: hash del archivo (df.attrs["file_hash"]),
+    largo y una huella del índice de filas, que distingue subconjuntos o
+    reordenamientos que heredan los attrs del DataFrame original.
+    None si el DataFrame no trae el hash del archivo.
+    """
+    clave = df.attrs.get("file_hash")
+    if clave is None:
+        return None
+    hashes = pd.util.hash_array(df.index.to_numpy())
+    huella = int((hashes * np.arange(1, len(hashes) + 1, dtype="uint64")).sum(dtype="uint64"))
+    return f"{clave}_{len(df)}_{huella}"
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _indice_cacheado(clave: str, _df: pd.DataFrame) -> IndiceFiltros:
+    return IndiceFiltros(_df)
+
+def indice_filtros(df: pd.DataFrame) -> IndiceFiltros:
+    """
+    Índice de filtros del DataFrame. Si el DataFrame trae el hash del archivo
+    en df.attrs["file_hash"], el índice se construye una sola vez por archivo.
+    """
+    clave = clave_cache(df)
+    if clave is None:
+        return IndiceFiltros(df)
+    return _indice_cacheado(clave, df)
@@ -0,0 +1,148 @@
+import os
+import json
+import time
+import logging
+import threading
+import tracemalloc
+from contextlib import contextmanager
+
+import pandas as pd
+
+# --- CONFIGURACIÓN ---
+def _activado(variable: str, defecto: str = "0") -> bool:
+    return os.environ.get(variable, defecto).strip().lower() in ("1", "true", "si", "sí", "yes")
+
+# Medición por etapa de la carga (apagada por defecto: no agrega costo)
+PERFILAR = _activado("GESTOR_PERFILAR_CARGA")
+# Pico de memoria con tracemalloc: aparte y apagado por defecto, porque hace
+# la carga bastante más lenta y distorsionaría los tiempos que se registran
+PERFILAR_MEMORIA = _activado("GESTOR_PERFILAR_MEMORIA")
+
+COLUMNAS_ETAPAS = ["Fuente", "Etapa", "Segundos", "Filas Entrada", "Filas Salida", "Pico MB"]
+MB = 1024 * 1024
+
+# Una línea JSON por etapa, para poder filtrarlas en los logs del servidor
+logger = logging.getLogger("gestor.carga")
+if PERFILAR and not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+
+# Estado por hilo: cada sesión de Streamlit corre su script en un hilo propio
+_local = threading.local()
+# Últimas mediciones por archivo (clave = file_hash), para el panel de la app
+_ultimas = {}
+_lock = threading.Lock()
+
+
+def _pila() -> list:
+    if not hasattr(_local, "pila"):
+        _local.pila = []
+    return _local.pila
+
+def _emitir(registro: dict) -> None:
+    logger.info(json.dumps({"evento": "etapa_carga", **registro}, ensure_ascii=False, default=str))
+    etapas = getattr(_local, "etapas", None)
+    if etapas is not None:
+        etapas.append(registro)
+
+
+# --- MEDICIÓN ---
+@contextmanager
+def etapa(nombre: str, filas_entrada: int = None):
+    """
+    Mide una etapa de la carga: tiempo, filas y pico de memoria sobre lo que
+    ya estaba asignado al empezar. Quien la usa completa registro["Filas Salida"].
+    Sin GESTOR_PERFILAR_CARGA no mide nada.
+    """
+    if not PERFILAR:
+        yield {}
+        return
+
+    registro = {
+        "Fuente": getattr(_local, "fuente", None), "Etapa": nombre,
+        "Segundos": None, "Filas Entrada": filas_entrada, "Filas Salida": None, "Pico MB": None,
+    }
+    memoria = PERFILAR_MEMORIA and tracemalloc.is_tracing()
+    pila = _pila()
+    base = 0
+    if memoria:
+        actual, pico = tracemalloc.get_traced_memory()
+        # El pico de la etapa contenedora no se pierde al reiniciarlo para esta
+        if pila:
+            pila[-1]["pico"] = max(pila[-1]["pico"], pico)
+        tracemalloc.reset_peak()
+        base = actual
+    marca = {"pico": base}
+    pila.append(marca)
+    t0 = time.perf_counter()
+    try:
+        yield registro
+    finally:
+        registro["Segundos"] = round(time.perf_counter() - t0, 4)
+        pila.pop()
+        if memoria:
+            pico = max(marca["pico"], tracemalloc.get_traced_memory()[1])
+            registro["Pico MB"] = round((pico - base) / MB, 2)
+            if pila:
+                pila[-1]["pico"] = max(pila[-1]["pico"], pico)
+        _emitir(registro)
+
+@contextmanager
+def sesion(fuente: str = None, clave: str = None):
+    """
+    Junta las etapas medidas dentro del bloque (en este hilo) en una lista.
+    Si se da `clave` (file_hash), al salir quedan como las últimas mediciones
+    de ese archivo para etapas_de. Con GESTOR_PERFILAR_MEMORIA inicia
+    tracemalloc si hace falta.
+    """
+    etapas = []
+    if not PERFILAR:
+        yield etapas
+        return
+
+    anteriores, fuente_anterior = getattr(_local, "etapas", None), getattr(_local, "fuente", None)
+    _local.etapas, _local.fuente = etapas, fuente if fuente is not None else fuente_anterior
+    iniciar = PERFILAR_MEMORIA and not tracemalloc.is_tracing()
+    if iniciar:
+        tracemalloc.start()
+    try:
+        yield etapas
+    finally:
+        if iniciar:
+            tracemalloc.stop()
+        _local.etapas, _local.fuente = anteriores, fuente_anterior
+        if clave is not None and etapas:
+            with _lock:
+                _ultimas[clave] = list(etapas)
+
+def agregar(etapas: list) -> None:
+    """Suma a la sesión activa etapas medidas en otro proceso (ingesta paralela)."""
+    actuales = getattr(_local, "etapas", None)
+    if PERFILAR and actuales is not None:
+        actuales.extend(etapas)
+
+
+# --- RESULTADOS ---
+def tabla_etapas(etapas: list) -> pd.DataFrame:
+    """
+    Etapas agrupadas por (Fuente, Etapa) en orden de ejecución: la lectura
+    por bloques de CSV repite etapas, que aquí se suman (el pico es el máximo).
+    """
+    df = pd.DataFrame(etapas, columns=COLUMNAS_ETAPAS)
+    if df.empty:
+        return df
+    df["Fuente"] = df["Fuente"].fillna("")
+    suma = lambda s: s.sum(min_count=1)
+    tabla = df.groupby(["Fuente", "Etapa"], sort=False).agg({
+        "Segundos": "sum", "Filas Entrada": suma, "Filas Salida": suma, "Pico MB": "max",
+    }).reset_index()
+    tabla["Segundos"] = tabla["Segundos"].round(3)
+    return tabla.astype({"Filas Entrada": "Int64", "Filas Salida": "Int64"})
+
+def etapas_de(clave: str) -> pd.DataFrame:
+    """Últimas mediciones de carga del archivo (vacío si vino de caché en este proceso)."""
+    with _lock:
+        etapas = _ultimas.get(clave, [])
+    return tabla_etapas(etapas)
@@ -0,0 +1,190 @@
+import os
+import io
+import time
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+
+import load_profiler
+import utils
+
+# --- CONFIGURACIÓN ---
+# Procesos para parsear archivos en paralelo (0 = según CPUs disponibles)
+INGESTA_PROCESOS = int(os.environ.get("GESTOR_INGESTA_PROCESOS", 0))
+# Bajo este total de MB, levantar procesos cuesta más que parsear en serie
+INGESTA_PARALELA_MIN_MB = float(os.environ.get("GESTOR_INGESTA_PARALELA_MB", 1))
+
+# Columna que identifica de qué archivo (y hoja) viene cada fila
+COL_FUENTE = "Fuente"
+
+COLUMNAS_DIAGNOSTICO = ["Fuente", "Encabezado", "Filas Leídas", "Filas", "Segundos", "Motor", "Estado"]
+
+
+# --- TAREAS ---
+def hojas_excel(contenido: bytes) -> list:
+    """Nombres de las hojas de un libro Excel, sin leer sus celdas."""
+    with pd.ExcelFile(io.BytesIO(contenido)) as libro:
+        return list(libro.sheet_names)
+
+def tareas_de_archivos(archivos, hojas=None) -> list:
+    """
+    Convierte [(nombre, contenido)] en tareas (nombre, contenido, hoja).
+    hojas: None = solo la primera hoja de cada Excel; True = todas las hojas;
+    lista = esas hojas, en los libros que las tengan. Cada hoja es una tarea
+    independiente (detección de encabezado y normalización propias).
+    """
+    tareas = []
+    for nombre, contenido in archivos:
+        es_excel = nombre.endswith(".xlsx") or nombre.endswith(".xls")
+        if hojas is None or not es_excel:
+            tareas.append((nombre, contenido, None))
+            continue
+        del_libro = hojas_excel(contenido)
+        elegidas = del_libro if hojas is True else [h for h in del_libro if h in hojas]
+        tareas.extend((nombre, contenido, hoja) for hoja in elegidas)
+    return tareas
+
+def etiqueta_fuente(nombre: str, hoja=None) -> str:
+    return nombre if hoja is None else f"{nombre} · {hoja}"
+
+def _cargar_tarea(tarea):
+    """
+    Worker: lee y normaliza una fuente (una hoja de Excel o un CSV).
+    Retorna (df, info) con encabezado detectado, filas leídas, segundos, error
+    y las etapas medidas por load_profiler (vacías si no está activado).
+    """
+    nombre, contenido, hoja = tarea
+    t0 = time.perf_counter()
+    info = {"Encabezado": None, "Filas Leídas": None, "Motor": None, "Error": None}
+    # Las etapas vuelven con el resultado: el proceso padre no ve las del worker
+    with load_profiler.sesion(etiqueta_fuente(nombre, hoja)) as etapas:
+        try:
+            archivo = io.BytesIO(contenido)
+            archivo.name = nombre
+            if nombre.endswith(".xlsx") or nombre.endswith(".xls"):
+                df_raw = utils.leer_excel_crudo(archivo, 0 if hoja is None else hoja)
+                info["Motor"] = utils.MOTOR_EXCEL or "openpyxl"
+                info["Filas Leídas"] = len(df_raw)
+                df, info["Encabezado"] = utils.normalizar_crudo(df_raw)
+            else:
+                # CSV: load_data decide si ingerir por bloques
+                df = utils.load_data(archivo)
+                info["Motor"] = "csv"
+            # El st.error de la normalización no llega desde otro proceso: el
+            # mensaje vuelve en el resultado y el padre lo muestra
+            if df is None:
+                info["Error"] = utils.ERROR_SIN_FECHA
+        except Exception as e:
+            df = None
+            info["Error"] = str(e)
+    info["Etapas"] = etapas
+    info["Segundos"] = round(time.perf_counter() - t0, 3)
+    return df, info
+
+
+# --- ESQUEMA ---
+def alinear_esquema(frames: list) -> list:
+    """
+    Lleva todos los DataFrames a la unión de columnas (en orden de aparición).
+    Las columnas faltantes se crean vacías con el tipo que tienen en el primer
+    archivo que las trae, para que concat no degrade Int16/fechas a object.
+    """
+    columnas = list(dict.fromkeys(c for df in frames for c in df.columns))
+    tipos = {}
+    for df in frames:
+        for col, tipo in df.dtypes.items():
+            tipos.setdefault(col, tipo)
+
+    alineados = []
+    for df in frames:
+        faltan = {c: pd.Series(index=df.index, dtype=tipos[c]) for c in columnas if c not in df.columns}
+        if faltan:
+            df = df.assign(**faltan)
+        alineados.append(df[columnas])
+    return alineados
+
+
+# --- CARGA ---
+def _cpus() -> int:
+    # CPUs asignadas al proceso (contenedores), no las de la máquina completa
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def _ejecutar(tareas, max_procesos: int = None) -> list:
+    n = min(max_procesos or INGESTA_PROCESOS or _cpus(), len(tareas))
+    total_mb = sum(len(contenido) for _, contenido, _ in tareas) / (1024 * 1024)
+    if n <= 1 or (max_procesos is None and total_mb < INGESTA_PARALELA_MIN_MB):
+        return [_cargar_tarea(t) for t in tareas]
+    # Sin fork: el servidor de Streamlit tiene hilos (tornado, logging, pyarrow) y un
+    # fork puede heredar sus locks tomados. _cargar_tarea es picklable a nivel de módulo
+    metodos = multiprocessing.get_all_start_methods()
+    contexto = multiprocessing.get_context("forkserver" if "forkserver" in metodos else "spawn")
+    try:
+        with ProcessPoolExecutor(max_workers=n, mp_context=contexto) as pool:
+            return list(pool.map(_cargar_tarea, tareas))
+    except (BrokenProcessPool, OSError) as e:
+        # Sin procesos disponibles (sandbox, límites del servidor): secuencial
+        print(f"Warning: ingesta paralela no disponible, se procesa en serie: {e}")
+        return [_cargar_tarea(t) for t in tareas]
+
+def errores(diagnostico: pd.DataFrame) -> list:
+    """Mensajes "fuente: error" de las fuentes que no se pudieron cargar."""
+    if diagnostico is None:
+        return []
+    fallidas = diagnostico[diagnostico["Estado"] != "OK"]
+    return [f"{fuente}: {estado}" for fuente, estado in zip(fallidas["Fuente"], fallidas["Estado"])]
+
+def clave_diagnostico(hash_combinado: str) -> str:
+    """Clave de disk_cache del diagnóstico, guardado junto al DataFrame combinado."""
+    return f"{hash_combinado}_diagnostico"
+
+def hash_fuentes(archivos, hojas=None) -> str:
+    """Hash combinado de varios archivos y hojas (independiente del orden en que se suben)."""
+    h = hashlib.md5()
+    for file_hash in sorted(hashlib.md5(c).hexdigest() for _, c in archivos):
+        h.update(file_hash.encode("utf-8"))
+    if hojas is not None:
+        h.update(repr(True if hojas is True else sorted(map(str, hojas))).encode("utf-8"))
+    return h.hexdigest()
+
+def cargar_varios(archivos, hojas=None, max_procesos: int = None):
+    """
+    Parsea varios archivos Excel/CSV (y/o varias hojas de cada libro) en un
+    pool de procesos, marca cada fila con su fuente en COL_FUENTE, alinea los
+    esquemas y concatena todo en un solo DataFrame.
+    archivos: lista de (nombre, contenido en bytes); hojas: ver tareas_de_archivos.
+    Retorna (df, diagnostico) con encabezado, filas, segundos y estado por fuente.
+    """
+    tareas = tareas_de_archivos(archivos, hojas)
+    resultados = _ejecutar(tareas, max_procesos)
+
+    frames, filas = [], []
+    for (nombre, _, hoja), (df, info) in zip(tareas, resultados):
+        fuente = etiqueta_fuente(nombre, hoja)
+        load_profiler.agregar(info["Etapas"])
+        ok = df is not None and not df.empty
+        filas.append({
+            "Fuente": fuente, "Encabezado": info["Encabezado"], "Filas Leídas": info["Filas Leídas"],
+            "Filas": len(df) if ok else 0, "Segundos": info["Segundos"], "Motor": info["Motor"],
+            "Estado": "OK" if ok else (info["Error"] or "Sin filas válidas"),
+        })
+        if ok:
+            frames.append(df.assign(**{COL_FUENTE: fuente}))
+
+    diagnostico = pd.DataFrame(filas, columns=COLUMNAS_DIAGNOSTICO).astype(
+        {"Encabezado": "Int64", "Filas Leídas": "Int64"}
+    )
+    if not frames:
+        return pd.DataFrame(), diagnostico
+
+    # Las categorías se recrean después de concatenar (igual que la carga por bloques)
+    with load_profiler.etapa("combinar", sum(len(f) for f in frames)) as etapa:
+        df = pd.concat(alinear_esquema(frames), ignore_index=True)
+        etapa["Filas Salida"] = len(df)
+    df = utils.compactar_tipos(df)
+    df[COL_FUENTE] = df[COL_FUENTE].astype("category")
+    return df, diagnostico
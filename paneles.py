@@ -0,0 +1,210 @@
+"""
+Secciones autocontenidas de las apps como st.fragment: al tocar uno de sus
+widgets se vuelve a ejecutar solo la función (sus filtros, cálculo y
+gráficos), no el script completo ni las demás pestañas. Los argumentos se
+guardan del último rerun completo.
+"""
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+import agg_cache
+import analytics
+import charts
+import utils
+
+
+# --- TAB 3: MAPA DE CALOR ---
+@st.fragment
+def mapa_calor_choques(df_t3: pd.DataFrame, sel_y3: list, meses_en_espanol: bool = True):
+    """Filtros t3_heat_* y gráfico de días con varias coordinadoras."""
+    st.markdown("### 🔥 Mapa de Calor: Choques de Coordinación")
+    st.caption("Días donde múltiples coordinadoras tienen clases simultáneamente.")
+
+    # Filtros locales para el mapa de calor
+    c_heat_1, c_heat_2, c_heat_3, c_heat_4, c_heat_5 = st.columns(5)
+
+    # Opciones de cada filtro y rango por defecto
+    op_heat = agg_cache.memo(analytics.opciones_mapa_calor, df_t3, {"Año": sel_y3}, meses_en_espanol)
+    sel_mes_heat = c_heat_1.multiselect("Filtrar Mes", op_heat["meses"], key="t3_heat_mes", persist_state=utils.PERSISTIR_WIDGETS, placeholder="Todos")
+    sel_dia_heat = c_heat_2.multiselect("Filtrar Día Semana", op_heat["dias"], key="t3_heat_dia", persist_state=utils.PERSISTIR_WIDGETS, placeholder="Todos")
+    sel_sede_heat = c_heat_3.multiselect("Filtrar Sede", op_heat["sedes"], key="t3_heat_sede", persist_state=utils.PERSISTIR_WIDGETS, placeholder="Todas")
+    sel_coord_heat = c_heat_4.multiselect("Filtrar Coord.", op_heat["coordinadoras"], key="t3_heat_coord", persist_state=utils.PERSISTIR_WIDGETS, placeholder="Todas")
+    sel_date_range = c_heat_5.date_input("Rango de Fechas", list(op_heat["rango"]), key="t3_heat_date", persist_state=utils.PERSISTIR_WIDGETS)
+
+    # Aplicar filtros
+    df_heat = analytics.filtrar_mapa_calor(df_t3, analytics.FiltrosCalor(
+        meses=tuple(sel_mes_heat), dias=tuple(sel_dia_heat), sedes=tuple(sel_sede_heat),
+        coordinadoras=tuple(sel_coord_heat), rango=tuple(sel_date_range),
+        meses_en_espanol=meses_en_espanol
+    ))
+    choques = analytics.dias_multiples_coordinadoras(df_heat)
+
+    if not choques.empty:
+        choques["Fecha"] = choques["DIAS/FECHAS"].dt.strftime("%d-%m-%Y")
+        fig_ch = px.scatter(choques, x="Fecha", y="N_Coords", size="N_Coords", color="N_Coords", 
+                            color_continuous_scale="Reds", range_color=[0, 6], title="Días con múltiples coordinadoras")
+        st.plotly_chart(charts.update_chart_layout(fig_ch), use_container_width=True)
+    else:
+        st.info("No se detectaron días con múltiples coordinadoras.")
+
+
+# --- GESTIÓN: SIMULADOR ---
+@st.fragment
+def reasignar_programa(modelo, progs_mes: list, coords_disp: list):
+    """
+    Selectores del simulador (sim_prog, sim_new_coord). Cambiarlos solo
+    refresca la coordinadora actual; aplicar el cambio hace un rerun completo
+    para que la comparativa y el optimizador vean la simulación.
+    """
+    # Interfaz de Reasignación
+    col_sim1, col_sim2, col_sim3 = st.columns(3)
+
+    with col_sim1:
+        prog_sel = st.selectbox("Seleccionar Programa a Reasignar", progs_mes, key="sim_prog", persist_state=utils.PERSISTIR_WIDGETS)
+
+    # Obtener coordinadora actual (considerando simulación previa)
+    coord_actual_sim = modelo.coordinadora_actual(prog_sel, st.session_state["sim_cambios"])
+
+    with col_sim2:
+        st.text_input("Coordinadora Actual (Simulada)", value=coord_actual_sim, disabled=True)
+
+    with col_sim3:
+        nueva_coord = st.selectbox("Asignar a Nueva Coordinadora", coords_disp, key="sim_new_coord", persist_state=utils.PERSISTIR_WIDGETS)
+
+    if st.button("🔄 Aplicar Cambio (Simulación)"):
+        st.session_state["sim_cambios"][prog_sel] = nueva_coord
+        st.success(f"Programa '{prog_sel}' reasignado a '{nueva_coord}' en la simulación.")
+        st.rerun()
+
+
+# --- GESTIÓN: DISTRIBUCIÓN SEMANAL ---
+@st.fragment
+def distribucion_semanal(df_g: pd.DataFrame):
+    """Filtros rad_* y gráficos de araña por día, sede y modalidad con el detalle por día."""
+    st.subheader("🕸️ Distribución Semanal de Carga")
+    st.caption("Visualiza qué días de la semana concentran más clases según los filtros seleccionados.")
+
+    # Filtros específicos para el gráfico de araña
+    c_rad1, c_rad2, c_rad3, c_rad4 = st.columns(4)
+
+    # 1. Coordinadora
+    coords_rad = analytics.valores_ordenados(df_g, "COORDINADORA RESPONSABLE")
+    sel_coord_rad = c_rad1.multiselect("Coordinadora", coords_rad, key="rad_coord", persist_state=utils.PERSISTIR_WIDGETS, placeholder="Todas")
+
+    # Filtrar df base para siguientes opciones
+    df_rad = analytics.filtrar_valores(df_g, "COORDINADORA RESPONSABLE", sel_coord_rad)
+
+    # 2. Mes (nombres en español de MESES_NOMBRE)
+    mes_nombre_rad = analytics.nombres_mes(df_rad["DIAS/FECHAS"])
+    meses_rad = analytics.ordenar_meses(mes_nombre_rad.unique())
+    sel_mes_rad = c_rad2.multiselect("Mes", meses_rad, key="rad_mes", persist_state=utils.PERSISTIR_WIDGETS, placeholder="Todos")
+
+    if sel_mes_rad:
+        df_rad = df_rad[mes_nombre_rad.isin(sel_mes_rad)]
+
+    # 3. Sede
+    sedes_rad = analytics.valores_ordenados(df_rad, "SEDE")
+    sel_sede_rad = c_rad3.multiselect("Sede", sedes_rad, key="rad_sede", persist_state=utils.PERSISTIR_WIDGETS, placeholder="Todas")
+    df_rad = analytics.filtrar_valores(df_rad, "SEDE", sel_sede_rad)
+
+    # 4. Programa
+    progs_rad = analytics.valores_ordenados(df_rad, "PROGRAMA")
+    sel_prog_rad = c_rad4.multiselect("Programa", progs_rad, key="rad_prog", persist_state=utils.PERSISTIR_WIDGETS, placeholder="Todos")
+    df_rad = analytics.filtrar_valores(df_rad, "PROGRAMA", sel_prog_rad)
+
+    if df_rad.empty:
+        st.warning("No hay datos con los filtros seleccionados.")
+    else:
+        # Layout de 3 columnas para gráficos
+        col_r1, col_r2, col_r3 = st.columns(3)
+
+        # Estilo común para los gráficos de araña
+        radar_style = dict(
+            line_close=True,
+            color_discrete_sequence=["#FF4B4B"], # Color rojo intenso
+            markers=True,
+        )
+
+        # 1. Gráfico Día
+        with col_r1:
+            conteo_dias = analytics.conteo_por(df_rad, "Dia_Semana", "Dia", orden=utils.DIAS_ORDEN)
+
+            fig_rad = px.line_polar(
+                conteo_dias, r='Clases', theta='Dia', 
+                title="<b>Por Día Semana</b>", 
+                line_close=True,
+                color_discrete_sequence=["black"],
+                markers=True # Enable markers for hover
+            )
+            fig_rad.update_traces(fill='toself', line=dict(color='black', width=3))
+            st.plotly_chart(charts.update_chart_layout(fig_rad), use_container_width=True)
+
+        # 2. Gráfico Sede
+        with col_r2:
+            conteo_sede = analytics.conteo_por(df_rad, "SEDE", "Sede")
+
+            fig_sede = px.line_polar(
+                conteo_sede, r='Clases', theta='Sede', 
+                title="<b>Por Sede</b>", 
+                line_close=True,
+                color_discrete_sequence=["black"],
+                markers=True # Enable markers for hover
+            )
+            fig_sede.update_traces(fill='toself', line=dict(color='black', width=3))
+            st.plotly_chart(charts.update_chart_layout(fig_sede), use_container_width=True)
+
+        # 3. Gráfico Modalidad
+        with col_r3:
+            conteo_mod = analytics.conteo_por(df_rad, "Modalidad_Calc", "Modalidad")
+
+            fig_mod = px.line_polar(
+                conteo_mod, r='Clases', theta='Modalidad', 
+                title="<b>Por Modalidad</b>", 
+                line_close=True,
+                color_discrete_sequence=["black"],
+                markers=True # Enable markers for hover
+            )
+            fig_mod.update_traces(fill='toself', line=dict(color='black', width=3))
+            st.plotly_chart(charts.update_chart_layout(fig_mod), use_container_width=True)
+
+        # Detalle Dinámico por Día
+        st.markdown("##### 📅 Detalle por Día Semana")
+
+        # Calcular día con más carga para ponerlo por defecto
+        if not df_rad.empty:
+            dias_counts = df_rad["Dia_Semana"].value_counts()
+            dia_max_carga = dias_counts.idxmax()
+
+            # Ordenar días para el selector
+            dias_disponibles = analytics.ordenar_dias(df_rad["Dia_Semana"].unique())
+
+            # Selector de día
+            idx_def = dias_disponibles.index(dia_max_carga) if dia_max_carga in dias_disponibles else 0
+            sel_dia_det = st.selectbox("Seleccionar Día para ver detalle:", dias_disponibles, index=idx_def, key="sel_dia_detalle_rad", persist_state=utils.PERSISTIR_WIDGETS)
+
+            # Filtrar y mostrar
+            df_dia_det = df_rad[df_rad["Dia_Semana"] == sel_dia_det].copy()
+            coords_dia = sorted(df_dia_det["COORDINADORA RESPONSABLE"].unique())
+
+            if not df_dia_det.empty:
+                st.success(f"**Coordinadoras con turno en {sel_dia_det}:** {', '.join(coords_dia)}")
+
+                # Ordenar por fecha
+                df_dia_det = df_dia_det.sort_values("DIAS/FECHAS")
+                df_dia_det["Fecha"] = df_dia_det["DIAS/FECHAS"].dt.strftime("%d-%m-%Y")
+
+                st.dataframe(
+                    df_dia_det[["Fecha", "COORDINADORA RESPONSABLE", "PROGRAMA", "SEDE"]],
+                    hide_index=True,
+                    use_container_width=True,
+                    column_config={
+                        "COORDINADORA RESPONSABLE": "Coordinadora",
+                        "PROGRAMA": "Programa",
+                        "SEDE": "Sede"
+                    }
+                )
+            else:
+                st.info(f"No hay clases para {sel_dia_det} con los filtros actuales.")
+        else:
+            st.info("No hay datos para mostrar detalle.")
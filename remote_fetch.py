@@ -0,0 +1,219 @@
+import os
+import hashlib
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# --- CONFIGURACIÓN ---
+# Límites configurables por variables de entorno
+DESCARGAS_DIR = os.environ.get(
+    "GESTOR_DESCARGAS_DIR",
+    os.path.join(tempfile.gettempdir(), "gestor_descargas"),
+)
+DESCARGA_MAX_MB = float(os.environ.get("GESTOR_DESCARGA_MAX_MB", 200))
+# (conexión, lectura) en segundos
+DESCARGA_TIMEOUT = (5, float(os.environ.get("GESTOR_DESCARGA_TIMEOUT", 60)))
+# Segundos en que una descarga se usa sin volver a preguntar al servidor
+REVALIDAR_CADA_S = float(os.environ.get("GESTOR_DESCARGA_REVALIDAR_S", 60))
+# Segundos que se conserva un archivo reemplazado: otra sesión puede estar leyéndolo
+GRACIA_REEMPLAZO_S = float(os.environ.get("GESTOR_DESCARGA_GRACIA_S", 600))
+
+CHUNK_BYTES = 1024 * 1024
+DOMINIOS_ONEDRIVE = ("sharepoint.com", "onedrive.live.com", "1drv.ms")
+
+
+class DescargaError(Exception):
+    """Error al descargar un archivo remoto (HTTP, tamaño o red)."""
+
+
+@dataclass
+class Descarga:
+    """Archivo remoto ya descargado a disco, con los validadores HTTP para revalidarlo."""
+    url: str
+    ruta: str
+    nombre: str
+    file_hash: str
+    tamano: int
+    etag: str = None
+    last_modified: str = None
+    revisado: float = 0.0
+
+
+# --- SESIÓN ---
+# Una sola sesión por proceso: reutiliza conexiones TCP/TLS entre descargas.
+# Solo se reintentan fallas de conexión; un timeout de lectura no se repite
+_REINTENTOS = Retry(total=2, connect=2, read=0, backoff_factor=0.3)
+_SESION = requests.Session()
+_SESION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=_REINTENTOS))
+_SESION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=_REINTENTOS))
+
+_descargas = {}
+_en_curso = {}
+# ruta -> momento en que otra versión la reemplazó
+_reemplazadas = {}
+_lock = threading.Lock()
+_ejecutor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="descarga")
+
+
+# --- URLS ---
+def url_descarga_directa(url: str) -> str:
+    """Fuerza la descarga directa en links de OneDrive / SharePoint (agrega download=1)."""
+    url = url.strip()
+    if any(d in url for d in DOMINIOS_ONEDRIVE) and "download=1" not in url:
+        sep = "&" if "?" in url else "?"
+        url = url + sep + "download=1"
+    return url
+
+def nombre_archivo(url: str, content_type: str = "") -> str:
+    """Nombre con extensión para load_data: CSV si la URL o el tipo lo indican, si no xlsx."""
+    if ".csv" in url.lower() or "csv" in (content_type or "").lower():
+        return "data_onedrive.csv"
+    return "data_onedrive.xlsx"
+
+
+# --- DESCARGA ---
+def _guardar_stream(resp: requests.Response, extension: str, max_bytes: float):
+    """Escribe el cuerpo por bloques a un temporal, calculando el hash. Retorna (ruta, hash, bytes)."""
+    os.makedirs(DESCARGAS_DIR, exist_ok=True)
+    h = hashlib.md5()
+    total = 0
+    fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=DESCARGAS_DIR)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for bloque in resp.iter_content(chunk_size=CHUNK_BYTES):
+                total += len(bloque)
+                if total > max_bytes:
+                    raise DescargaError(f"El archivo supera el límite de {max_bytes / (1024 * 1024):.0f} MB.")
+                h.update(bloque)
+                f.write(bloque)
+        file_hash = h.hexdigest()
+        # El nombre final es el hash del contenido: ruta y hash nunca se desincronizan
+        ruta = os.path.join(DESCARGAS_DIR, file_hash + extension)
+        os.replace(tmp, ruta)
+        return ruta, file_hash, total
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+def descargar(url: str, anterior: Descarga = None, max_mb: float = None) -> Descarga:
+    """
+    Descarga la URL a disco en streaming. Si hay una descarga anterior, envía
+    If-None-Match / If-Modified-Since: con 304 se reutiliza el archivo ya
+    descargado (mismo file_hash, así la carga tampoco se repite).
+    """
+    url_directa = url_descarga_directa(url)
+    max_bytes = (DESCARGA_MAX_MB if max_mb is None else max_mb) * 1024 * 1024
+
+    headers = {}
+    if anterior is not None and os.path.exists(anterior.ruta):
+        if anterior.etag:
+            headers["If-None-Match"] = anterior.etag
+        if anterior.last_modified:
+            headers["If-Modified-Since"] = anterior.last_modified
+
+    try:
+        with _SESION.get(url_directa, headers=headers, stream=True, timeout=DESCARGA_TIMEOUT) as resp:
+            if resp.status_code == 304:
+                # Un 304 sin petición condicional no trae cuerpo: no hay nada que guardar
+                if not headers:
+                    raise DescargaError("El servidor respondió 304 sin una descarga anterior que reutilizar.")
+                anterior.revisado = time.time()
+                return anterior
+            resp.raise_for_status()
+
+            largo = resp.headers.get("Content-Length")
+            if largo and largo.isdigit() and int(largo) > max_bytes:
+                raise DescargaError(f"El archivo supera el límite de {max_bytes / (1024 * 1024):.0f} MB.")
+
+            nombre = nombre_archivo(url_directa, resp.headers.get("Content-Type"))
+            ruta, file_hash, tamano = _guardar_stream(resp, os.path.splitext(nombre)[1], max_bytes)
+            return Descarga(
+                url=url, ruta=ruta, nombre=nombre, file_hash=file_hash, tamano=tamano,
+                etag=resp.headers.get("ETag"),
+                last_modified=resp.headers.get("Last-Modified"),
+                revisado=time.time(),
+            )
+    except requests.RequestException as e:
+        raise DescargaError(f"No se pudo descargar el archivo: {e}") from e
+
+def _barrer_reemplazadas(ahora: float) -> None:
+    """Borra los archivos reemplazados hace más de GRACIA_REEMPLAZO_S que ya nadie usa."""
+    with _lock:
+        en_uso = {d.ruta for d in _descargas.values()}
+        vencidas = [r for r, t in _reemplazadas.items() if ahora - t > GRACIA_REEMPLAZO_S]
+        for ruta in vencidas:
+            del _reemplazadas[ruta]
+    for ruta in vencidas:
+        if ruta in en_uso:
+            continue
+        try:
+            os.remove(ruta)
+        except OSError:
+            pass
+
+def _actualizar(url: str) -> Descarga:
+    with _lock:
+        anterior = _descargas.get(url)
+    nueva = descargar(url, anterior)
+    ahora = time.time()
+    with _lock:
+        _descargas[url] = nueva
+        _reemplazadas.pop(nueva.ruta, None)
+        # Contenido nuevo: el archivo anterior no se borra en el acto, una sesión
+        # que acaba de recibir su ruta desde obtener() puede estar abriéndolo
+        if anterior is not None and anterior.ruta != nueva.ruta:
+            _reemplazadas.setdefault(anterior.ruta, ahora)
+    _barrer_reemplazadas(ahora)
+    return nueva
+
+def _revalidar_en_segundo_plano(url: str) -> None:
+    def tarea():
+        try:
+            _actualizar(url)
+        except Exception as e:
+            # Se sigue usando la copia actual; el próximo rerun lo reintenta
+            print(f"Warning: no se pudo revalidar {url}: {e}")
+        finally:
+            with _lock:
+                _en_curso.pop(url, None)
+
+    with _lock:
+        if url in _en_curso:
+            return
+        _en_curso[url] = _ejecutor.submit(tarea)
+
+def obtener(url: str) -> Descarga:
+    """
+    Descarga del archivo remoto para la app. La primera vez descarga en forma
+    bloqueante; después usa la copia en disco y, pasado REVALIDAR_CADA_S,
+    la revalida en segundo plano (el rerun siguiente ve la versión nueva).
+    """
+    with _lock:
+        actual = _descargas.get(url)
+    if actual is None or not os.path.exists(actual.ruta):
+        return _actualizar(url)
+    if time.time() - actual.revisado > REVALIDAR_CADA_S:
+        _revalidar_en_segundo_plano(url)
+    return actual
+
+def purgar() -> int:
+    """Borra las descargas guardadas en disco. Retorna cuántos archivos borró."""
+    with _lock:
+        _descargas.clear()
+        _reemplazadas.clear()
+    if not os.path.isdir(DESCARGAS_DIR):
+        return 0
+    borrados = 0
+    for nombre in os.listdir(DESCARGAS_DIR):
+        try:
+            os.remove(os.path.join(DESCARGAS_DIR, nombre))
+            borrados += 1
+        except OSError:
+            pass
+    return borrados
@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import filter_index
+import utils
+
+# --- CONFIGURACIÓN ---
+COL_COORD = "COORDINADORA RESPONSABLE"
+COL_PROG = "PROGRAMA"
+
+# Meses en orden cronológico (nombres en español, sin depender del locale)
+MESES_ORDEN = [utils.MESES_NOMBRE[m] for m in range(1, 13)]
+
+# Abreviaturas para la matriz de Gestión
+REEMPLAZOS_PROGRAMA = {
+    "MAGISTER": "MAG.", "DIPLOMADO": "DIPL.", "DIRECCION": "DIR.",
+    "GESTION": "GEST.", "NEGOCIOS": "NEG.", "PRESENCIAL": "PRES.",
+    "CORPORATIVO": "CORP.", "ORGANIZACIONES": "ORG.", "MARKETING": "MKT.",
+    "MANAGEMENT": "MGMT.", "SOSTENIBLES": "SOST.", "INNOVACION": "INNOV."
+}
+LARGO_MAX_PROGRAMA = 40
+
+
+def compactar_nombre(nombre) -> str:
+    """Nombre de programa abreviado para la matriz mensual."""
+    n = str(nombre).upper()
+    for k, v in REEMPLAZOS_PROGRAMA.items():
+        n = n.replace(k, v)
+    # Truncar si es muy largo
+    if len(n) > LARGO_MAX_PROGRAMA:
+        n = n[:LARGO_MAX_PROGRAMA - 3] + "..."
+    return n
+
+
+class CuboSesiones:
+    """
+    Conteo de sesiones por (Año, Mes, Coordinadora, Programa), construido una
+    vez por archivo. La matriz mensual de Gestión, el selector de mes de la
+    carga laboral y la evolución de la pestaña Global leen de este cubo en vez
+    de reagrupar las filas del archivo en cada rerun.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        fechas = df["DIAS/FECHAS"]
+        cubo = df.groupby(
+            [fechas.dt.year.rename("Año"), fechas.dt.month.rename("Mes_Num"), COL_COORD, COL_PROG],
+            observed=True
+        ).size().reset_index(name="Sesiones")
+
+        cubo["Año"] = cubo["Año"].astype("int64")
+        cubo["Mes_Num"] = cubo["Mes_Num"].astype("int64")
+        cubo["Mes"] = cubo["Mes_Num"].map(utils.MESES_NOMBRE)
+        cubo["Periodo"] = cubo["Año"].astype(str) + "-" + cubo["Mes_Num"].astype(str).str.zfill(2)
+
+        # La compactación se aplica solo a la lista de programas distintos
+        codigos, programas = pd.factorize(cubo[COL_PROG].astype(str))
+        cortos = np.array([compactar_nombre(p) for p in programas], dtype=object)
+        cubo["Programa_Corto"] = cortos[codigos]
+
+        self.cubo = cubo
+
+    def filtrar(self, anios=None) -> pd.DataFrame:
+        """Celdas del cubo de los años seleccionados. Sin selección = todos."""
+        if not anios:
+            return self.cubo
+        return self.cubo[self.cubo["Año"].isin(anios)]
+
+    def meses(self, anios=None) -> list:
+        """Números de mes con sesiones en los años seleccionados, ordenados."""
+        return sorted(self.filtrar(anios)["Mes_Num"].unique().tolist())
+
+    def matriz(self, anios=None) -> pd.DataFrame:
+        """Matriz (Coordinadora, Programa abreviado) x Mes con el número de sesiones."""
+        cubo = self.filtrar(anios)
+        matriz = cubo.groupby(
+            [COL_COORD, "Programa_Corto", "Mes"], observed=True
+        )["Sesiones"].sum().unstack("Mes", fill_value=0)
+        matriz.index = matriz.index.rename([COL_COORD, COL_PROG])
+        return matriz[[m for m in MESES_ORDEN if m in matriz.columns]]
+
+    def top_programas(self, anios=None, n: int = 10) -> pd.Index:
+        """Los n programas con más sesiones en los años seleccionados."""
+        # Mismo orden que value_counts() sobre las filas (también en los empates)
+        totales = self.filtrar(anios).groupby(COL_PROG, observed=False)["Sesiones"].sum()
+        return totales.sort_values(ascending=False).head(n).index
+
+    def evolucion(self, anios=None, programas=None) -> pd.DataFrame:
+        """Sesiones por periodo (AAAA-MM) y programa, opcionalmente solo para algunos programas."""
+        cubo = self.filtrar(anios)
+        if programas is not None:
+            cubo = cubo[cubo[COL_PROG].isin(programas)]
+        evol = cubo.groupby(["Periodo", COL_PROG], observed=True)["Sesiones"].sum()
+        return evol.reset_index().rename(columns={"Periodo": "Mes"})
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _cubo_cacheado(clave: str, _df: pd.DataFrame) -> CuboSesiones:
+    return CuboSesiones(_df)
+
+def cubo_sesiones(df: pd.DataFrame) -> CuboSesiones:
+    """
+    Cubo de sesiones del DataFrame. Si el DataFrame trae el hash del archivo
+    en df.attrs["file_hash"], el cubo se construye una sola vez por archivo.
+    """
+    clave = filter_index.clave_cache(df)
+    if clave is None:
+        return CuboSesiones(df)
+    return _cubo_cacheado(clave, df)
@@ -0,0 +1,48 @@
+"""agg_cache.memo: la clave incluye las filas del DataFrame y los resultados no se comparten."""
+import pandas as pd
+
+import agg_cache
+import workload
+
+
+def _df(n=6):
+    df = pd.DataFrame({
+        "COORDINADORA RESPONSABLE": ["ANA", "ANA", "BEA", "BEA", "BEA", "CAROLA"][:n],
+        "PROGRAMA": ["MBA", "MSc", "MBA", "MKT", "MKT", "FIN"][:n],
+        "Nº ALUMNOS": [25, 35, 25, 10, 10, 50][:n],
+        "DIAS/FECHAS": pd.date_range("2025-03-03", periods=6)[:n],
+    })
+    df.attrs["file_hash"] = "h"
+    return df
+
+def _conteo(df):
+    return df.groupby("COORDINADORA RESPONSABLE").size()
+
+
+def test_seleccion_que_no_corresponde_al_df_no_reutiliza_resultado():
+    agg_cache.CACHE.limpiar()
+    df = _df()
+    completo = agg_cache.memo(_conteo, df, {"Año": [2025]})
+    # Mismo file_hash y misma selección declarada, pero otras filas
+    parcial = agg_cache.memo(_conteo, df.iloc[:2], {"Año": [2025]})
+    assert completo.sum() == 6
+    assert parcial.sum() == 2
+
+def test_mismo_df_y_seleccion_es_acierto():
+    agg_cache.CACHE.limpiar()
+    df = _df()
+    agg_cache.memo(_conteo, df, {"Año": [2025]})
+    agg_cache.memo(_conteo, df.copy(), {"Año": ["2025"]})
+    stats = agg_cache.CACHE.estadisticas().set_index("Función")
+    assert stats["Aciertos"].sum() == 1
+
+def test_modelo_cacheado_no_se_comparte():
+    agg_cache.CACHE.limpiar()
+    df = _df()
+    modelo = agg_cache.memo(workload.modelo_carga, df, None, "Nº ALUMNOS")
+    modelo.puntaje_base["ANA"] = -1
+    modelo.pares.loc[:, "Puntaje"] = 0
+    otro = agg_cache.memo(workload.modelo_carga, df, None, "Nº ALUMNOS")
+    assert otro is not modelo
+    assert otro.puntaje_base["ANA"] != -1
+    assert (otro.pares["Puntaje"] > 0).all()
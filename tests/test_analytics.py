@@ -0,0 +1,55 @@
+"""analytics.gestion: selección del mes para el Puntaje y detalle por programa."""
+import numpy as np
+import pandas as pd
+
+import analytics
+import workload
+
+
+def _df(alumnos=True):
+    df = pd.DataFrame({
+        "COORDINADORA RESPONSABLE": ["ANA", "ANA", "BEA", "BEA"],
+        "PROGRAMA": ["MBA", "MSc", "MBA", "FIN"],
+        "DIAS/FECHAS": pd.to_datetime(["2025-03-03", "2025-03-04", "2025-04-01", "2025-04-02"]),
+        "Mes": ["Marzo", "Marzo", "Abril", "Abril"],
+    })
+    if alumnos:
+        df["Nº ALUMNOS"] = [25.0, np.nan, 30.0, 0.0]
+    return df
+
+
+def test_preparar_carga_todos_los_meses_es_copia():
+    df = _df()
+    carga = analytics.preparar_carga(df)
+    assert len(carga.df) == 4 and carga.col_alumnos == "Nº ALUMNOS"
+    assert not carga.sin_columna_alumnos
+    assert carga.df["Nº ALUMNOS"].tolist() == [25.0, 0.0, 30.0, 0.0]
+    # El DataFrame original no se toca
+    assert df["Nº ALUMNOS"].isna().sum() == 1
+
+def test_preparar_carga_filtra_el_mes():
+    carga = analytics.preparar_carga(_df(), "Abril")
+    assert carga.df["PROGRAMA"].tolist() == ["MBA", "FIN"]
+
+def test_preparar_carga_sin_columna_de_alumnos():
+    carga = analytics.preparar_carga(_df(alumnos=False), "Marzo")
+    assert carga.sin_columna_alumnos
+    assert carga.col_alumnos == "Nº ALUMNOS"
+    assert (carga.df["Nº ALUMNOS"] == 0).all()
+
+def test_columna_alumnos_por_nombre_parcial():
+    df = _df().rename(columns={"Nº ALUMNOS": "Total Alumnos"})
+    assert analytics.columna_alumnos(df) == "Total Alumnos"
+    assert analytics.preparar_carga(df).col_alumnos == "Total Alumnos"
+
+def test_detalle_programas_marca_matricula_y_filtra():
+    carga = analytics.preparar_carga(_df())
+    pares = workload.ModeloCarga(carga.df, carga.col_alumnos).pares
+    detalle = analytics.detalle_programas(pares)
+    estado = dict(zip(zip(detalle["COORDINADORA RESPONSABLE"], detalle["PROGRAMA"]), detalle["Estado Alumnos"]))
+    assert estado == {("ANA", "MBA"): "Ok", ("ANA", "MSc"): "Por definir",
+                      ("BEA", "FIN"): "Por definir", ("BEA", "MBA"): "Ok"}
+    assert "Estado Alumnos" not in pares.columns
+
+    solo_bea = analytics.detalle_programas(pares, ["BEA"])
+    assert set(solo_bea["COORDINADORA RESPONSABLE"]) == {"BEA"}
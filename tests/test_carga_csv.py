@@ -0,0 +1,47 @@
+"""Ingesta de CSV por bloques: mismo resultado que la lectura completa."""
+import io
+
+import pandas as pd
+import pytest
+
+import utils
+
+# Encabezado en la fila 5, bajo filas basura (como las exportaciones reales)
+CSV = (
+    "Planificación 2025,,,,\n,,,,\nGenerado por,X,,,\n,,,,\n"
+    "PROGRAMA,COORDINADORA,DIAS/FECHAS,HORA INICIO,HORA FIN\n"
+    + "".join(f"MBA {i % 3},ANA,0{i % 9 + 1}/03/2025,09:00,12:30\n" for i in range(60))
+)
+
+
+def _archivo():
+    archivo = io.BytesIO(CSV.encode("utf-8"))
+    archivo.name = "plan.csv"
+    return archivo
+
+
+@pytest.mark.parametrize("chunksize", [1, 2, 7, 1000])
+def test_bloques_igual_a_lectura_completa(chunksize):
+    completo = utils.load_data(_archivo())
+    por_bloques = utils.load_data(_archivo(), chunksize=chunksize)
+    pd.testing.assert_frame_equal(por_bloques, completo, check_names=False)
+
+def test_estadisticas_de_carga_viajan_con_el_df():
+    df = utils.load_data(_archivo(), chunksize=10)
+    carga = df.attrs["carga"]
+    assert carga["chunksize"] == 10
+    assert carga["filas_leidas"] == 60 and carga["filas_validas"] == 60
+    assert "60 válidas" in utils.resumen_carga_bloques(carga)
+
+def test_pico_de_memoria():
+    _, stats = utils.cargar_csv_por_bloques(_archivo(), chunksize=10, medir_memoria=True)
+    assert stats["pico_mb"] > 0
+
+def test_reporte_exporta_horas_como_texto():
+    df = utils.load_data(_archivo())
+    hoja = pd.read_excel(io.BytesIO(utils.generate_excel_report(df)), sheet_name="Datos_Completos")
+    columnas = list(hoja.columns)
+    assert "HORA_INICIO_MIN" not in columnas
+    assert columnas.index("HORA_INICIO") == list(df.columns).index("HORA_INICIO_MIN")
+    assert hoja["HORA_INICIO"].iloc[0] == "09:00:00"
+    assert hoja["HORA_FIN"].iloc[0] == "12:30:00"
@@ -0,0 +1,72 @@
+"""Consultas del motor DuckDB contra las funciones pandas de analytics.resumenes."""
+import pandas as pd
+import pytest
+
+pytest.importorskip("duckdb")
+
+import agg_cache
+import filter_index
+import utils
+from analytics import columnar, resumenes
+from benchmarks import sinteticos
+
+HOY = pd.Timestamp("2025-06-15")
+# estado_programas con y sin Sum_Horas
+ARGS = {resumenes.estado_programas: [(HOY,), (HOY, False)]}
+
+
+@pytest.fixture(scope="module")
+def df(tmp_path_factory):
+    ruta = sinteticos.archivo_sintetico(3000, 1, "csv", str(tmp_path_factory.mktemp("sint")))
+    with open(ruta, "rb") as archivo:
+        df = utils.load_data(archivo)
+    df.attrs["file_hash"] = "sintetico_3000"
+    return df
+
+@pytest.fixture(scope="module")
+def motor(df):
+    return columnar.MotorColumnar(df)
+
+def _selecciones(df):
+    idx = filter_index.IndiceFiltros(df)
+    return [
+        {},
+        {"Año": idx.opciones("Año", None)[:1]},
+        {"COORDINADORA RESPONSABLE": idx.opciones("COORDINADORA RESPONSABLE", None)[:2]},
+        {"Mes": idx.opciones("Mes", None)[:2], "Dia_Semana": ["Lunes", "Sábado"]},
+    ]
+
+def _args(func, df):
+    if func is resumenes.evolucion_dia_semana:
+        return [(tuple(sorted(df["PROGRAMA"].dropna().unique())[:5]),)]
+    return ARGS.get(func, [()])
+
+
+@pytest.mark.parametrize("func", list(columnar.CONSULTAS), ids=lambda f: f.__name__)
+def test_consulta_igual_a_pandas(df, motor, func):
+    consulta, _ = columnar.CONSULTAS[func]
+    idx = filter_index.IndiceFiltros(df)
+    for seleccion in _selecciones(df):
+        sub = idx.filtrar(df, seleccion)
+        for args in _args(func, df):
+            pd.testing.assert_frame_equal(
+                consulta(motor, seleccion, *args), func(sub, *args),
+                check_exact=False, rtol=1e-9,
+                # evolucion_dia_semana: el SQL no conoce las categorías de PROGRAMA que no aparecen
+                check_categorical=func is not resumenes.evolucion_dia_semana,
+            )
+
+@pytest.mark.parametrize("func, args", [
+    (resumenes.carga_diaria_coordinadoras, ()),
+    (resumenes.estado_programas, (HOY,)),
+], ids=["carga_diaria", "estado_programas"])
+def test_memo_usa_pandas_si_df_no_es_la_seleccion(df, motor, monkeypatch, func, args):
+    monkeypatch.setitem(columnar._MOTORES, df.attrs["file_hash"], motor)
+    agg_cache.CACHE.limpiar()
+    seleccion = _selecciones(df)[1]
+    sub = filter_index.IndiceFiltros(df).filtrar(df, seleccion)
+
+    pd.testing.assert_frame_equal(columnar.memo(func, sub, seleccion, *args), func(sub, *args))
+    # Mismas attrs y selección declarada, pero menos filas: no puede salir del SQL
+    parcial = sub.iloc[: len(sub) // 2]
+    pd.testing.assert_frame_equal(columnar.memo(func, parcial, seleccion, *args), func(parcial, *args))
@@ -0,0 +1,64 @@
+"""Detección de choques por recurso (barrido) en casos borde."""
+import numpy as np
+import pandas as pd
+
+import conflicts
+
+
+def _sesiones(filas):
+    """filas: (profesor, sede, sala, programa, fecha, inicio "HH:MM", fin "HH:MM")."""
+    df = pd.DataFrame(filas, columns=["PROFESOR", "SEDE", "SALA", "PROGRAMA", "DIAS/FECHAS", "HORA_INICIO", "HORA_FIN"])
+    df["DIAS/FECHAS"] = pd.to_datetime(df["DIAS/FECHAS"])
+    return df
+
+
+def test_pares_solapados_encuentra_todos_los_pares():
+    i, j = conflicts.pares_solapados([0, 0, 0, 1], [0, 10, 20, 0], [100, 30, 25, 100])
+    assert sorted(zip(i.tolist(), j.tolist())) == [(0, 1), (0, 2), (1, 2)]
+
+def test_pares_solapados_ignora_duracion_cero_e_invertidas():
+    # La 1 dura cero minutos y la 2 termina antes de empezar: ninguna choca con la 0
+    i, j = conflicts.pares_solapados([0, 0, 0], [0, 30, 50], [100, 30, 40])
+    assert len(i) == 0 and len(j) == 0
+
+def test_choques_sin_solape_cero_ni_negativo():
+    df = _sesiones([
+        ("ANA", "CENTRO", "101", "MBA", "2025-03-03", "09:00", "12:00"),
+        ("ANA", "CENTRO", "101", "MBA", "2025-03-03", "10:00", "10:00"),
+        ("ANA", "CENTRO", "101", "MBA", "2025-03-03", "11:00", "10:00"),
+        ("ANA", "CENTRO", "101", "MSc", "2025-03-03", "11:00", "13:00"),
+    ])
+    choques = conflicts.detectar_choques_recurso(df, "Profesor")
+    assert len(choques) == 1
+    assert (choques["Solape_Min"] > 0).all()
+    assert choques.loc[0, "Solape_Min"] == 60
+
+def test_marcadores_y_rellenos_no_son_recursos():
+    df = _sesiones([
+        ("POR DEFINIR", "POR DEFINIR", "A-101", "SIN ASIGNAR", "2025-03-03", "09:00", "12:00"),
+        ("SIN PROFESOR", "POR DEFINIR", "A-101", "SIN ASIGNAR", "2025-03-03", "10:00", "11:00"),
+        ("SIN PROFESOR", "CENTRO", "POR DEFINIR", "SIN PROGRAMA", "2025-03-03", "10:30", "11:30"),
+        ("POR DEFINIR", "CENTRO", "POR DEFINIR", "SIN PROGRAMA", "2025-03-03", "09:30", "11:00"),
+    ])
+    df["COORDINADORA RESPONSABLE"] = ["SIN ASIGNAR", "SIN COORDINADORA RESPONSABLE"] * 2
+    df["ASIGNATURA"] = "X"
+    for etiqueta in conflicts.recursos_disponibles(df):
+        assert conflicts.detectar_choques_recurso(df, etiqueta).empty, etiqueta
+
+def test_sedes_virtuales_no_chocan_como_salas():
+    df = _sesiones([
+        ("ANA", "ONLINE", "ZOOM 1", "MBA", "2025-03-03", "09:00", "12:00"),
+        ("LUIS", "ONLINE", "ZOOM 1", "MSc", "2025-03-03", "10:00", "11:00"),
+        ("ANA", "CENTRO", "A-101", "MBA", "2025-03-04", "09:00", "12:00"),
+        ("LUIS", "CENTRO", "A-101", "MSc", "2025-03-04", "10:00", "11:00"),
+    ])
+    salas = conflicts.detectar_choques_recurso(df, "Sala")
+    assert salas["Recurso"].astype(str).tolist() == ["CENTRO / A-101"]
+
+def test_valores_vacios_se_ignoran_en_todo_recurso():
+    df = _sesiones([
+        ("ANA", "CENTRO", "-", "MBA", "2025-03-03", "09:00", "12:00"),
+        ("LUIS", "CENTRO", "-", "MSc", "2025-03-03", "10:00", "11:00"),
+    ])
+    assert conflicts.detectar_choques_recurso(df, "Sala").empty
+    assert np.array_equal(conflicts.detectar_choques_recurso(df, "Profesor").columns, conflicts.COLUMNAS_CHOQUES)
@@ -0,0 +1,21 @@
+"""Sello de versión de la caché en disco."""
+import pandas as pd
+
+import disk_cache
+import multi_ingest
+
+
+def test_sello_incluye_multi_ingest(monkeypatch, tmp_path):
+    assert multi_ingest in disk_cache.MODULOS_ESQUEMA
+    monkeypatch.setattr(disk_cache, "CACHE_DIR", str(tmp_path))
+    disk_cache.version_load_data.cache_clear()
+    disk_cache.guardar("abc", pd.DataFrame({"PROGRAMA": ["MBA"]}))
+    assert disk_cache.leer("abc") is not None
+
+    # Con otro código en los módulos productores la entrada anterior ya no se lee
+    monkeypatch.setattr(disk_cache, "MODULOS_ESQUEMA", (disk_cache.utils,))
+    disk_cache.version_load_data.cache_clear()
+    try:
+        assert disk_cache.leer("abc") is None
+    finally:
+        disk_cache.version_load_data.cache_clear()
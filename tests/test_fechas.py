@@ -0,0 +1,36 @@
+"""convertir_fechas_uai (vectorizada) contra convertir_fecha_uai fila a fila."""
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import utils
+
+NATIVAS = [datetime(2025, 3, 12), pd.Timestamp("2024-11-05 18:30"), None]
+TEXTOS = [
+    "12/03/2025", " 3-4-2025 ", "07.10.2024", "31/02/2025",
+    "12 de marzo 2025", "Miércoles 5 de Mayo 2025", "1 de setiembre 2024",
+    "9 de mÁrzo 2025", "30 de febrero 2025", "3 de brumario 2025",
+    "", "   ", "sin fecha", "xx/yy/zzzz", "2025-03-12", np.nan,
+]
+
+
+def _esperado(serie: pd.Series) -> pd.Series:
+    return pd.to_datetime(serie.apply(utils.convertir_fecha_uai), errors="coerce").astype("datetime64[ns]")
+
+
+@pytest.mark.parametrize("valores", [
+    NATIVAS,
+    TEXTOS,
+    NATIVAS + TEXTOS,
+    TEXTOS + [7, 2.5],
+    [np.nan, None],
+], ids=["nativas", "textos", "mezcla", "con_numeros", "solo_nulos"])
+def test_misma_salida_que_la_version_fila_a_fila(valores):
+    serie = pd.Series(valores * 3, dtype=object, index=range(10, 10 + 3 * len(valores)))
+    pd.testing.assert_series_equal(utils.convertir_fechas_uai(serie), _esperado(serie))
+
+def test_columna_ya_datetime_se_devuelve_igual():
+    serie = pd.Series(pd.to_datetime(["2025-03-12", None]))
+    assert utils.convertir_fechas_uai(serie) is serie
@@ -0,0 +1,25 @@
+"""multi_ingest: errores de los workers de vuelta en el diagnóstico."""
+import os
+
+import multi_ingest
+import utils
+
+PRUEBA1 = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Prueba1.xlsx")
+
+
+def test_errores_de_workers_vuelven_al_padre():
+    with open(PRUEBA1, "rb") as f:
+        contenido = f.read()
+    archivos = [("plan.xlsx", contenido), ("sin_fecha.csv", b"x,y\n1,2\n"), ("roto.xlsx", b"basura")]
+    # max_procesos fuerza el pool (forkserver/spawn) aunque los archivos sean chicos
+    df, diagnostico = multi_ingest.cargar_varios(archivos, max_procesos=2)
+
+    assert not df.empty
+    assert set(df[multi_ingest.COL_FUENTE].unique()) == {"plan.xlsx"}
+    errores = multi_ingest.errores(diagnostico)
+    assert errores[0] == f"sin_fecha.csv: {utils.ERROR_SIN_FECHA}"
+    assert errores[1].startswith("roto.xlsx: ")
+    assert len(errores) == 2
+
+def test_sin_diagnostico_no_hay_errores():
+    assert multi_ingest.errores(None) == []
@@ -0,0 +1,41 @@
+"""Paridad de las reglas vectorizadas (Factor Alumnos, % Avance) con sus referencias escalares."""
+import numpy as np
+import pandas as pd
+import pytest
+
+import utils
+from benchmarks import reglas
+
+HOY = pd.Timestamp("2025-09-15")
+
+
+@pytest.mark.parametrize("n", [0, 1, 19, 19.5, 20, 29, 30, 39, 40, 48, 48.9, 49, 50, 120, -3, np.nan])
+def test_factor_alumnos_bordes(n):
+    assert utils.factor_alumnos(pd.Series([n]))[0] == utils.get_factor_alumnos(n)
+
+def test_factor_alumnos_paridad():
+    alumnos = reglas.datos_alumnos(20_000)
+    esperado = alumnos.apply(utils.get_factor_alumnos).to_numpy()
+    np.testing.assert_array_equal(utils.factor_alumnos(alumnos), esperado)
+
+@pytest.mark.parametrize("inicio, fin", [
+    (pd.NaT, pd.Timestamp("2025-10-01")),            # sin inicio
+    (pd.Timestamp("2025-01-01"), pd.NaT),            # sin fin
+    (pd.Timestamp("2025-09-01"), pd.Timestamp("2025-09-01")),  # un solo día
+    (pd.Timestamp("2025-10-01"), pd.Timestamp("2025-09-01")),  # fin antes del inicio
+    (pd.Timestamp("2025-10-01"), pd.Timestamp("2025-12-01")),  # aún no empieza
+    (pd.Timestamp("2025-01-01"), pd.Timestamp("2025-09-15")),  # termina hoy
+    (pd.Timestamp("2025-01-01"), pd.Timestamp("2025-03-01")),  # ya terminó
+    (pd.Timestamp("2025-09-01"), pd.Timestamp("2025-09-30")),  # en curso
+])
+def test_porcentaje_avance_bordes(inicio, fin):
+    calculado = utils.porcentaje_avance(pd.Series([inicio]), pd.Series([fin]), HOY)
+    assert calculado.iloc[0] == utils.get_avance(inicio, fin, HOY)
+
+@pytest.mark.parametrize("hoy", ["2024-06-01", "2025-09-15", "2028-01-01 17:30"])
+def test_porcentaje_avance_paridad(hoy):
+    hoy = pd.Timestamp(hoy)
+    stats = reglas.datos_programas(20_000)
+    esperado = stats.apply(lambda r: utils.get_avance(r["Inicio"], r["Fin"], hoy), axis=1)
+    calculado = utils.porcentaje_avance(stats["Inicio"], stats["Fin"], hoy)
+    pd.testing.assert_series_equal(calculado, esperado.astype("int64"))
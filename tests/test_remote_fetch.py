@@ -0,0 +1,123 @@
+"""remote_fetch contra un servidor HTTP local (http.server) que responde con ETag."""
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import remote_fetch
+
+
+class _Estado:
+    """Lo que sirve el servidor: contenido, ETag y cuántas veces respondió 200."""
+    contenido = b"PROGRAMA;FECHA\nMBA;2025-03-01\n"
+    etag = '"v1"'
+    descargas = 0
+    espera_s = 0.0
+
+
+class _Manejador(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.startswith("/no-existe"):
+            self.send_error(404)
+            return
+        if self.path.startswith("/siempre-304"):
+            self.send_response(304)
+            self.end_headers()
+            return
+        if self.path.startswith("/lento"):
+            time.sleep(_Estado.espera_s)
+        if self.headers.get("If-None-Match") == _Estado.etag:
+            self.send_response(304)
+            self.send_header("ETag", _Estado.etag)
+            self.end_headers()
+            return
+        _Estado.descargas += 1
+        self.send_response(200)
+        self.send_header("Content-Type", "text/csv")
+        self.send_header("Content-Length", str(len(_Estado.contenido)))
+        self.send_header("ETag", _Estado.etag)
+        self.end_headers()
+        self.wfile.write(_Estado.contenido)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def servidor(tmp_path, monkeypatch):
+    monkeypatch.setattr(remote_fetch, "DESCARGAS_DIR", str(tmp_path))
+    monkeypatch.setattr(_Estado, "descargas", 0)
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Manejador)
+    httpd.daemon_threads = True
+    hilo = threading.Thread(target=httpd.serve_forever, daemon=True)
+    hilo.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+    remote_fetch.purgar()
+
+
+def test_primera_descarga_200(servidor):
+    d = remote_fetch.descargar(servidor + "/plan.csv")
+    assert d.etag == '"v1"'
+    assert d.nombre == "data_onedrive.csv"
+    assert d.tamano == len(_Estado.contenido)
+    with open(d.ruta, "rb") as f:
+        assert f.read() == _Estado.contenido
+    assert os.path.basename(d.ruta) == d.file_hash + ".csv"
+
+def test_revalidacion_304_reutiliza_archivo(servidor):
+    d = remote_fetch.descargar(servidor + "/plan.csv")
+    revisado = d.revisado
+    d2 = remote_fetch.descargar(servidor + "/plan.csv", d)
+    assert d2 is d
+    assert d2.ruta == d.ruta and d2.file_hash == d.file_hash
+    assert d2.revisado >= revisado
+    assert _Estado.descargas == 1
+
+def test_contenido_nuevo_reemplaza_archivo(servidor, monkeypatch):
+    url = servidor + "/plan.csv"
+    d = remote_fetch._actualizar(url)
+    monkeypatch.setattr(_Estado, "contenido", b"PROGRAMA;FECHA\nMBA;2025-04-01\n")
+    monkeypatch.setattr(_Estado, "etag", '"v2"')
+    d2 = remote_fetch._actualizar(url)
+    assert d2.etag == '"v2"' and d2.file_hash != d.file_hash
+    with open(d2.ruta, "rb") as f:
+        assert f.read() == _Estado.contenido
+    assert remote_fetch.obtener(url) is d2
+    # El archivo anterior sigue en disco durante el período de gracia
+    assert os.path.exists(d.ruta)
+
+def test_archivo_reemplazado_se_borra_pasada_la_gracia(servidor, monkeypatch):
+    monkeypatch.setattr(remote_fetch, "GRACIA_REEMPLAZO_S", 0)
+    url = servidor + "/plan.csv"
+    d = remote_fetch._actualizar(url)
+    monkeypatch.setattr(_Estado, "contenido", b"otro contenido")
+    monkeypatch.setattr(_Estado, "etag", '"v3"')
+    remote_fetch._actualizar(url)
+    time.sleep(0.01)
+    remote_fetch._barrer_reemplazadas(time.time())
+    assert not os.path.exists(d.ruta)
+
+def test_404_es_descarga_error(servidor):
+    with pytest.raises(remote_fetch.DescargaError):
+        remote_fetch.descargar(servidor + "/no-existe.csv")
+
+def test_304_sin_descarga_anterior_es_descarga_error(servidor):
+    with pytest.raises(remote_fetch.DescargaError, match="304"):
+        remote_fetch.descargar(servidor + "/siempre-304.csv")
+    assert not os.listdir(remote_fetch.DESCARGAS_DIR)
+
+def test_archivo_demasiado_grande_es_descarga_error(servidor):
+    with pytest.raises(remote_fetch.DescargaError, match="límite"):
+        remote_fetch.descargar(servidor + "/plan.csv", max_mb=10 / (1024 * 1024))
+    # No quedan temporales a medio escribir
+    assert not [n for n in os.listdir(remote_fetch.DESCARGAS_DIR) if n.endswith(".tmp")]
+
+def test_timeout_es_descarga_error(servidor, monkeypatch):
+    monkeypatch.setattr(remote_fetch, "DESCARGA_TIMEOUT", (1, 0.2))
+    monkeypatch.setattr(_Estado, "espera_s", 1.0)
+    with pytest.raises(remote_fetch.DescargaError):
+        remote_fetch.descargar(servidor + "/lento.csv")
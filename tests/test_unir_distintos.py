@@ -0,0 +1,48 @@
+"""utils.unir_distintos contra las lambdas de groupby que reemplazó."""
+import numpy as np
+import pandas as pd
+import pytest
+
+import utils
+
+
+def _lambda(df, claves, columna):
+    return df.groupby(claves, observed=True)[columna].apply(
+        lambda x: ", ".join(sorted(x.dropna().unique()))
+    )
+
+@pytest.fixture
+def df():
+    # Orden de aparición distinto del orden alfabético, repetidos y NaN en medio
+    return pd.DataFrame({
+        "COORD": ["ANA", "ANA", "ANA", "LUIS", "LUIS", "ANA", "EVA", "LUIS", "ANA"],
+        "SEDE": ["B", "A", "B", "A", "A", "B", "A", "B", "A"],
+        "PROGRAMA": ["MSc", "MBA", np.nan, "ZETA", "ALFA", "Diplomado", np.nan, "ALFA", "MBA"],
+    })
+
+
+@pytest.mark.parametrize("claves", ["COORD", ["COORD", "SEDE"]])
+@pytest.mark.parametrize("categorias", [False, True])
+def test_igual_a_la_lambda(df, claves, categorias):
+    if categorias:
+        df = df.astype({"COORD": "category", "PROGRAMA": "category"})
+    esperado = _lambda(df, claves, "PROGRAMA")
+    obtenido = utils.unir_distintos(df, claves, "PROGRAMA")
+    # Grupos solo con NaN: la lambda da "", unir_distintos los omite (los llamadores hacen fillna(""))
+    obtenido = obtenido.reindex(esperado.index).fillna("")
+    assert obtenido.tolist() == esperado.tolist()
+
+def test_orden_alfabetico_no_de_aparicion(df):
+    res = utils.unir_distintos(df, "COORD", "PROGRAMA")
+    assert res["ANA"] == "Diplomado, MBA, MSc"
+    assert res["LUIS"] == "ALFA, ZETA"
+    assert "EVA" not in res.index
+
+def test_sin_nan_igual_a_la_lambda_sin_dropna(df):
+    sub = df.dropna(subset=["PROGRAMA"])
+    esperado = sub.groupby("COORD")["PROGRAMA"].agg(lambda x: ", ".join(sorted(x.unique())))
+    pd.testing.assert_series_equal(utils.unir_distintos(sub, "COORD", "PROGRAMA"), esperado, check_names=False)
+
+def test_sin_filas():
+    vacio = pd.DataFrame({"COORD": [], "PROGRAMA": []})
+    assert utils.unir_distintos(vacio, "COORD", "PROGRAMA").empty
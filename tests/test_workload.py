@@ -0,0 +1,59 @@
+"""ModeloCarga.simular (incremental) contra recalcular puntaje_programas desde las filas."""
+import numpy as np
+import pandas as pd
+import pytest
+
+import workload
+
+COORDS = ["ANA", "BEA", "CAROLA", "DORA"]
+PROGRAMAS = [f"P{i}" for i in range(12)]
+
+
+def _df_carga(rng) -> pd.DataFrame:
+    n = 120
+    df = pd.DataFrame({
+        workload.COL_COORD: rng.choice(COORDS, n),
+        workload.COL_PROG: rng.choice(PROGRAMAS, n),
+        "DIAS/FECHAS": pd.Timestamp("2025-03-03") + pd.to_timedelta(rng.integers(0, 60, n), unit="D"),
+        "Nº ALUMNOS": rng.integers(0, 60, n),
+    })
+    # Programas repartidos entre varias coordinadoras: asegurar al menos uno
+    df.loc[:5, workload.COL_PROG] = "P0"
+    df.loc[:5, workload.COL_COORD] = ["ANA", "BEA", "CAROLA"] * 2
+    return df
+
+def _recalculo_completo(df_carga, cambios) -> dict:
+    """Camino original: copiar, reasignar con .loc y volver a agrupar."""
+    df = df_carga.copy()
+    for prog, nueva in cambios.items():
+        df.loc[df[workload.COL_PROG] == prog, workload.COL_COORD] = nueva
+    tabla = workload.puntaje_programas(df, [workload.COL_COORD, workload.COL_PROG], "Nº ALUMNOS")
+    return tabla.groupby(workload.COL_COORD)["Puntaje"].sum().to_dict()
+
+
+@pytest.mark.parametrize("semilla", range(100))
+def test_simular_igual_a_recalculo_completo(semilla):
+    rng = np.random.default_rng(semilla)
+    df_carga = _df_carga(rng)
+    modelo = workload.ModeloCarga(df_carga, "Nº ALUMNOS")
+
+    # Entre 1 y 5 movimientos, a veces hacia una coordinadora nueva
+    destinos = COORDS + ["NUEVA"]
+    progs = rng.choice(PROGRAMAS, rng.integers(1, 6), replace=False)
+    cambios = {p: str(rng.choice(destinos)) for p in progs}
+
+    esperado = _recalculo_completo(df_carga, cambios)
+    simulado = modelo.simular(cambios)
+    assert simulado.keys() == esperado.keys()
+    for coord, puntaje in esperado.items():
+        assert simulado[coord] == pytest.approx(puntaje, abs=1e-9)
+
+    comparativa = modelo.comparativa(cambios).set_index(workload.COL_COORD)
+    for coord, puntaje in esperado.items():
+        assert comparativa.loc[coord, "Puntaje_Simulado"] == pytest.approx(puntaje, abs=1e-9)
+
+def test_sin_cambios_es_la_tabla_real():
+    df_carga = _df_carga(np.random.default_rng(0))
+    modelo = workload.ModeloCarga(df_carga, "Nº ALUMNOS")
+    assert modelo.simular({}) == pytest.approx(_recalculo_completo(df_carga, {}))
+    assert modelo.simular({"NO_EXISTE": "ANA"}) == pytest.approx(modelo.puntaje_base)
@@ -1,12 +1,21 @@
 import streamlit as st
 import pandas as pd
 import io
+import os
+import time
+import tempfile
+import itertools
+import importlib.util
+import tracemalloc
 from datetime import datetime
 
 # --- CARGA DE DATOS ---
 import re
 import numpy as np
 
+import filter_index
+import load_profiler
+
 # --- CONSTANTES ---
 MESES = {
     "enero": 1, "febrero": 2, "marzo": 3, "abril": 4,
@@ -26,6 +35,11 @@ DIAS_SEMANA_MAP = {
     "Thursday": "Jueves", "Friday": "Viernes", "Saturday": "Sábado", "Sunday": "Domingo",
 }
 
+DIAS_ORDEN = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"]
+
+# Columnas de texto con pocos valores distintos: se guardan como category
+COLUMNAS_CATEGORICAS = ["COORDINADORA RESPONSABLE", "PROGRAMA", "SEDE", "PROFESOR", "Modalidad_Calc"]
+
 # --- FUNCIONES AUXILIARES ---
 def quitar_acentos(texto: str) -> str:
     reemplazos = (("á", "a"), ("é", "e"), ("í", "i"), ("ó", "o"), ("ú", "u"))
@@ -52,83 +66,376 @@ def convertir_fecha_uai(texto):
         return datetime(anio, mes, dia)
     except: return np.nan
 
+# Patrones para el parseo vectorizado (mismos formatos que convertir_fecha_uai)
+RE_FECHA_NUMERICA = r"^\d{1,2}[/\-.]\d{1,2}[/\-.]\d{4}$"
+RE_FECHA_TEXTO = r"(\d{1,2})\s+de\s+([a-záéíóú]+)\s+(\d{4})"
+TABLA_ACENTOS = str.maketrans("áéíóú", "aeiou")
+
+def convertir_fechas_uai(serie: pd.Series) -> pd.Series:
+    """
+    Versión vectorizada de convertir_fecha_uai para una columna completa.
+    Resuelve por bloques (fechas nativas, dd/mm/aaaa y "D de MES AAAA")
+    y solo aplica la función fila a fila sobre el residuo que nada reconoció.
+    """
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie
+
+    resultado = pd.Series(pd.NaT, index=serie.index, dtype="datetime64[ns]")
+    if serie.empty:
+        return resultado
+
+    pendiente = serie.notna()
+    # Tipo de la columna en una sola pasada en C: "datetime" (todas nativas),
+    # "string" o "mixed"; cualquier otro caso queda completo para el residuo
+    tipo = pd.api.types.infer_dtype(serie, skipna=True)
+    texto = serie.str.strip() if tipo in ("string", "mixed", "mixed-integer") else None
+
+    # 1. Fechas nativas (datetime / Timestamp), solas o mezcladas con textos
+    no_texto = pendiente if texto is None else pendiente & texto.isna()
+    if no_texto.any() and pd.api.types.infer_dtype(serie[no_texto], skipna=True) == "datetime":
+        resultado[no_texto] = pd.to_datetime(serie[no_texto])
+        pendiente &= ~no_texto
+
+    # 2. Textos: se normalizan una sola vez (.str deja NaN en lo que no es str)
+    if texto is not None and texto.notna().any():
+        texto = texto.dropna()
+        vacio = texto == ""
+        pendiente[vacio[vacio].index] = False
+        texto = texto[~vacio]
+
+        # 2a. Numéricas día-primero (dd/mm/aaaa, dd-mm-aaaa, dd.mm.aaaa)
+        m_num = texto.str.match(RE_FECHA_NUMERICA)
+        if m_num.any():
+            normal = texto[m_num].str.replace(r"[\-.]", "/", regex=True)
+            parsed = pd.to_datetime(normal, format="%d/%m/%Y", errors="coerce")
+            ok = parsed.notna()
+            resultado[ok[ok].index] = parsed[ok]
+            pendiente[ok[ok].index] = False
+
+        # 2b. "12 de marzo 2025": un solo str.extract + lookup contra MESES
+        restante = texto[pendiente[texto.index]]
+        if not restante.empty:
+            partes = restante.str.lower().str.extract(RE_FECHA_TEXTO).dropna()
+            if not partes.empty:
+                mes = partes[1].str.translate(TABLA_ACENTOS).map(MESES)
+                parsed = pd.to_datetime(
+                    pd.DataFrame({
+                        "year": partes[2].astype(int),
+                        "month": mes,
+                        "day": partes[0].astype(int),
+                    }),
+                    errors="coerce",
+                )
+                # Si el texto calza con el patrón, el resultado ya es definitivo
+                # (mes desconocido o día inválido -> NaT, igual que la versión escalar)
+                resultado[parsed.index] = parsed
+                pendiente[parsed.index] = False
+
+    # 3. Residuo: función original, una vez por valor distinto
+    if pendiente.any():
+        resto = serie[pendiente]
+        convertidos = {v: convertir_fecha_uai(v) for v in pd.unique(resto)}
+        resultado[pendiente] = pd.to_datetime(resto.map(convertidos), errors="coerce")
+
+    return resultado
+
+# --- HORAS ---
+# Texto de hora como lo entregaba la carga antes de guardar minutos ("09:30:00")
+FORMATO_HORA = "{:02d}:{:02d}:00"
+
+def minutos_desde_medianoche(serie: pd.Series) -> pd.Series:
+    """
+    Horas de una columna (time, datetime o textos 'HH:MM[:SS]') como minutos
+    desde medianoche (Int16, nulo si no se reconoce). Cada valor distinto se
+    parsea una sola vez y el resultado se reparte a las filas por código.
+    """
+    codigos, distintos = pd.factorize(serie)
+    t = pd.to_datetime(pd.Series(distintos, dtype=object).astype(str), errors="coerce")
+    # Último lugar: nulos de la columna (código -1)
+    minutos = np.append((t.dt.hour * 60 + t.dt.minute).to_numpy(dtype="float64"), np.nan)
+    return pd.Series(minutos[codigos], index=serie.index).astype("Int16")
+
+def formatear_minutos(minutos: pd.Series, formato: str = "{:02d}:{:02d}", vacio: str = "") -> pd.Series:
+    """Minutos desde medianoche a texto de hora; formatea cada valor distinto una sola vez."""
+    codigos, distintos = pd.factorize(minutos)
+    textos = [formato.format(int(m) // 60, int(m) % 60) for m in distintos] + [vacio]
+    return pd.Series(np.array(textos, dtype=object)[codigos], index=minutos.index)
+
+# --- DETECCIÓN DE ENCABEZADO ---
+KEYWORDS_HEADER = ["DIAS/FECHAS", "FECHA", "DIA", "DATE"]
+# Filas iniciales donde se busca el encabezado
+MAX_FILAS_ENCABEZADO = 50
+
+def detectar_encabezado(df_raw, keywords=KEYWORDS_HEADER, max_filas=MAX_FILAS_ENCABEZADO):
+    """
+    Busca la fila de encabezados en las primeras `max_filas` filas.
+    Recorre las celdas una sola vez con un patrón combinado y luego resuelve
+    la prioridad de `keywords` solo sobre las celdas candidatas.
+    Retorna (indice_fila, keyword) o (None, None) si no encuentra nada.
+    """
+    df_scan = df_raw.head(max_filas)
+    if df_scan.empty:
+        return None, None
+
+    # Aplanar el bloque a una sola serie de textos (fila de origen como índice)
+    filas = np.repeat(df_scan.index.to_numpy(), df_scan.shape[1])
+    celdas = pd.Series(df_scan.to_numpy().ravel(), index=filas).astype(str).str.upper()
+
+    patron = "|".join(re.escape(k.upper()) for k in keywords)
+    candidatas = celdas[celdas.str.contains(patron, regex=True, na=False)]
+    if candidatas.empty:
+        return None, None
+
+    # Misma prioridad que antes: primera keyword de la lista, primera fila donde aparece
+    for keyword in keywords:
+        hit = candidatas.str.contains(keyword.upper(), regex=False)
+        if hit.any():
+            return int(hit[hit].index.min()), keyword
+    return None, None
+
+def encabezado_primera_fila(df_raw):
+    """
+    Usa la primera fila de df_raw como encabezado, igual que pd.read_excel(file)
+    o pd.read_csv(file) con header=0, pero sin volver a parsear el archivo.
+    """
+    if df_raw.empty:
+        return df_raw.copy()
+    nombres = []
+    vistos = {}
+    for i, valor in enumerate(df_raw.iloc[0]):
+        nombre = f"Unnamed: {i}" if pd.isna(valor) else str(valor)
+        # Duplicados como pandas: "COL", "COL.1", "COL.2", ...
+        if nombre in vistos:
+            vistos[nombre] += 1
+            nombre = f"{nombre}.{vistos[nombre]}"
+        else:
+            vistos[nombre] = 0
+        nombres.append(nombre)
+    df = df_raw.iloc[1:].reset_index(drop=True)
+    df.columns = nombres
+    return df.infer_objects()
+
 # --- CARGA DE DATOS ---
-# @st.cache_data (Removed to avoid hashing issues with file objects)
-def load_data(file):
+ERROR_SIN_FECHA = "No se encontró columna de Fecha."
+# CSV desde este tamaño se ingieren por bloques (configurable por entorno)
+CSV_CHUNKSIZE = int(os.environ.get("GESTOR_CSV_CHUNKSIZE", 50_000))
+CSV_STREAMING_MIN_BYTES = int(os.environ.get("GESTOR_CSV_STREAMING_MB", 20)) * 1024 * 1024
+
+# Motor de lectura Excel: calamine (Rust, mucho más rápido) si está instalado;
+# None deja que pandas elija (openpyxl para .xlsx)
+MOTOR_EXCEL = "calamine" if importlib.util.find_spec("python_calamine") else None
+
+def _tamano_archivo(file):
+    size = getattr(file, "size", None)
+    if size is not None:
+        return size
     try:
-        # 1. Leer archivo crudo
-        if file.name.endswith('.xlsx') or file.name.endswith('.xls'):
-            df_raw = pd.read_excel(file, header=None)
-        else:
-            df_raw = pd.read_csv(file, header=None)
-
-        # 2. Buscar fila de encabezados
-        keywords_header = ["DIAS/FECHAS", "FECHA", "DIA", "DATE"]
-        header_idx = None
-        # Optimization: Only search first 50 rows
-        df_scan = df_raw.head(50)
-        for keyword in keywords_header:
-            mask = df_scan.apply(lambda row: row.astype(str).str.contains(keyword, case=False, na=False)).any(axis=1)
-            if mask.any():
-                header_idx = df_scan[mask].index[0]
-                break
-        
+        pos = file.tell()
+        file.seek(0, os.SEEK_END)
+        size = file.tell()
+        file.seek(pos)
+        return size
+    except Exception:
+        return 0
+
+def leer_excel_crudo(file, hoja=0):
+    """Hoja del libro sin encabezados (header=None), con el motor más rápido disponible."""
+    with load_profiler.etapa("lectura_excel") as etapa:
+        df_raw = pd.read_excel(file, header=None, sheet_name=hoja, engine=MOTOR_EXCEL)
+        etapa["Filas Salida"] = len(df_raw)
+    return df_raw
+
+def normalizar_crudo(df_raw):
+    """
+    Detecta el encabezado de una hoja cruda y la normaliza.
+    Retorna (df, fila del encabezado); df es None si no hay columna de fecha.
+    """
+    with load_profiler.etapa("encabezado", len(df_raw)) as etapa:
+        # Buscar fila de encabezados (una sola pasada, sin releer el archivo)
+        header_idx, _ = detectar_encabezado(df_raw)
+
         if header_idx is None:
-            # Fallback: intentar leer normal si no encuentra header complejo
-            if file.name.endswith('.xlsx') or file.name.endswith('.xls'):
-                df = pd.read_excel(file)
-            else:
-                df = pd.read_csv(file)
+            # Fallback: usar la primera fila como encabezado (equivale a leer normal)
+            df = encabezado_primera_fila(df_raw)
         else:
             # Procesar desde el header encontrado
             df = df_raw.loc[header_idx:].reset_index(drop=True)
             df.columns = df.iloc[0].astype(str).str.strip().str.upper()
             df = df[1:].reset_index(drop=True)
+        etapa["Filas Salida"] = len(df)
 
-        # 3. Normalizar columnas
-        df.columns = df.columns.str.strip().str.upper()
-        cols = list(df.columns)
+    df = normalizar_planificacion(df)
+    return (compactar_tipos(df) if df is not None else None), header_idx
 
-        def find_col(options):
-            for opt in options:
-                for c in cols:
-                    if opt in c: return c
-            return None
+# @st.cache_data (Removed to avoid hashing issues with file objects)
+def load_data(file, chunksize=None, hoja=0):
+    """
+    Lee y normaliza una planificación Excel/CSV.
+    hoja: hoja del libro Excel a leer (índice o nombre); se ignora en CSV.
+    """
+    try:
+        es_excel = file.name.endswith('.xlsx') or file.name.endswith('.xls')
 
-        col_fecha = find_col(["DIAS/FECHAS", "FECHA", "DIA"])
-        col_coord = find_col(["COORDINADORA", "COORD"])
-        col_prog = find_col(["PROGRAMA", "CARRERA"])
-        col_sede = find_col(["SEDE", "UBICACION"])
-        col_prof = find_col(["PROFESOR", "DOCENTE", "RELATOR"])
-        
-        # Validar mínima
-        if not col_fecha:
-            st.error("No se encontró columna de Fecha.")
+        # CSV grandes: ingesta por bloques para no tener todo el archivo como texto en memoria
+        if not es_excel and (chunksize or _tamano_archivo(file) >= CSV_STREAMING_MIN_BYTES):
+            # El pico de memoria solo se mide con el perfilador activo (tracemalloc es lento)
+            df, stats = cargar_csv_por_bloques(
+                file, chunksize or CSV_CHUNKSIZE,
+                medir_memoria=load_profiler.PERFILAR and load_profiler.PERFILAR_MEMORIA
+            )
+            if df is not None:
+                # Viaja con el DataFrame (y con la caché en disco) al panel Diagnóstico
+                df.attrs["carga"] = stats
+            return df
+
+        # 1. Leer archivo crudo
+        if es_excel:
+            df_raw = leer_excel_crudo(file, hoja)
+        else:
+            with load_profiler.etapa("lectura_csv") as etapa:
+                df_raw = pd.read_csv(file, header=None)
+                etapa["Filas Salida"] = len(df_raw)
+
+        df, _ = normalizar_crudo(df_raw)
+        return df
+    except Exception as e:
+        # Re-lanzar la excepción para que sea manejada por la app principal
+        raise Exception(f"Error en utils.load_data: {str(e)}")
+
+def cargar_csv_por_bloques(file, chunksize=CSV_CHUNKSIZE, medir_memoria=True):
+    """
+    Ingesta de CSV por bloques de `chunksize` filas.
+    Detecta el encabezado en las primeras max(chunksize, MAX_FILAS_ENCABEZADO)
+    filas y pasa cada bloque por la misma normalización de load_data,
+    concatenando solo los resultados ya tipados.
+    Retorna (df, stats) con filas leídas/válidas, nº de bloques, tiempo y, si
+    medir_memoria=True, el pico de memoria (tracemalloc, agrega overhead).
+    """
+    t0 = time.perf_counter()
+    # Con el perfilador de carga tracemalloc ya corre: el pico sale de su etapa
+    midiendo = medir_memoria and not tracemalloc.is_tracing()
+    if midiendo:
+        tracemalloc.start()
+
+    stats = {"chunksize": chunksize, "bloques": 0, "filas_leidas": 0, "filas_validas": 0}
+    etapa = {}
+    try:
+        with load_profiler.etapa("csv_por_bloques") as etapa:
+            df = _leer_bloques(file, chunksize, stats)
+            etapa["Filas Salida"] = stats["filas_validas"]
+        return df, stats
+    finally:
+        if midiendo:
+            _, pico = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            stats["pico_mb"] = round(pico / (1024 * 1024), 2)
+        elif medir_memoria and etapa.get("Pico MB") is not None:
+            stats["pico_mb"] = etapa["Pico MB"]
+        stats["segundos"] = round(time.perf_counter() - t0, 3)
+
+def resumen_carga_bloques(stats: dict) -> str:
+    """Línea para el panel Diagnóstico con las estadísticas de cargar_csv_por_bloques."""
+    texto = (f"CSV por bloques: {stats['bloques']} bloques de {stats['chunksize']:,} filas · "
+             f"{stats['filas_leidas']:,} leídas · {stats['filas_validas']:,} válidas · {stats['segundos']} s")
+    if stats.get("pico_mb") is not None:
+        texto += f" · pico {stats['pico_mb']} MB"
+    return texto
+
+def _leer_bloques(file, chunksize, stats):
+    # dtype=str: mismo tipo por columna en todos los bloques (como la lectura completa,
+    # donde la fila de encabezado deja cada columna como texto)
+    lector = pd.read_csv(file, header=None, chunksize=chunksize, dtype=str)
+
+    # Con bloques chicos el encabezado puede estar más abajo que el primer bloque:
+    # se juntan bloques hasta cubrir las filas donde lo busca load_data
+    iniciales, n = [], 0
+    for bloque in lector:
+        iniciales.append(bloque)
+        n += len(bloque)
+        if n >= MAX_FILAS_ENCABEZADO:
+            break
+    if not iniciales:
+        return pd.DataFrame()
+    primero = pd.concat(iniciales) if len(iniciales) > 1 else iniciales[0]
+
+    header_idx, _ = detectar_encabezado(primero)
+    if header_idx is None:
+        header_idx = primero.index[0]
+        columnas = encabezado_primera_fila(primero.loc[[header_idx]]).columns
+    else:
+        columnas = primero.loc[header_idx].astype(str).str.strip().str.upper().rename(None)
+    desfase = header_idx + 1
+
+    bloques = []
+    for bloque in itertools.chain([primero.loc[header_idx + 1:]], lector):
+        stats["bloques"] += 1
+        stats["filas_leidas"] += len(bloque)
+        bloque.columns = columnas
+        # Mismo índice que tendría la lectura completa
+        bloque.index = bloque.index - desfase
+        df_bloque = normalizar_planificacion(bloque)
+        if df_bloque is None:
             return None
-            
-        # Renombrar para estandarizar
-        rename_map = {col_fecha: "DIAS/FECHAS"}
-        if col_coord: rename_map[col_coord] = "COORDINADORA RESPONSABLE"
-        if col_prog: rename_map[col_prog] = "PROGRAMA"
-        if col_sede: rename_map[col_sede] = "SEDE"
-        if col_prof: rename_map[col_prof] = "PROFESOR"
-        
-        df = df.rename(columns=rename_map)
+        bloques.append(df_bloque)
+
+    # Las categorías se crean recién aquí: concatenar categóricas con distintas
+    # categorías por bloque las devolvería a object
+    df = compactar_tipos(pd.concat(bloques)) if bloques else pd.DataFrame()
+    stats["filas_validas"] = len(df)
+    return df
+
+def normalizar_planificacion(df):
+    """
+    Normaliza un bloque ya con encabezados: estandariza columnas, parsea fechas
+    y horas, y agrega las columnas calculadas. Retorna None si no hay columna de fecha.
+    """
+    # 3. Normalizar columnas
+    df.columns = df.columns.str.strip().str.upper()
+    cols = list(df.columns)
+
+    def find_col(options):
+        for opt in options:
+            for c in cols:
+                if opt in c: return c
+        return None
+
+    col_fecha = find_col(["DIAS/FECHAS", "FECHA", "DIA"])
+    col_coord = find_col(["COORDINADORA", "COORD"])
+    col_prog = find_col(["PROGRAMA", "CARRERA"])
+    col_sede = find_col(["SEDE", "UBICACION"])
+    col_prof = find_col(["PROFESOR", "DOCENTE", "RELATOR"])
+    
+    # Validar mínima
+    if not col_fecha:
+        st.error(ERROR_SIN_FECHA)
+        return None
         
-        # Si falta Coordinadora, avisar (es crítico para T_1)
-        if "COORDINADORA RESPONSABLE" not in df.columns:
-            # Si no existe, creamos una dummy o avisamos? T_1 depende de esto.
-            # Intentamos ser flexibles:
-            df["COORDINADORA RESPONSABLE"] = "SIN ASIGNAR"
-
-        # 4. Procesar Fechas
-        df["DIAS/FECHAS"] = df["DIAS/FECHAS"].apply(convertir_fecha_uai)
+    # Renombrar para estandarizar
+    rename_map = {col_fecha: "DIAS/FECHAS"}
+    if col_coord: rename_map[col_coord] = "COORDINADORA RESPONSABLE"
+    if col_prog: rename_map[col_prog] = "PROGRAMA"
+    if col_sede: rename_map[col_sede] = "SEDE"
+    if col_prof: rename_map[col_prof] = "PROFESOR"
+    
+    df = df.rename(columns=rename_map)
+    
+    # Si falta Coordinadora, avisar (es crítico para T_1)
+    if "COORDINADORA RESPONSABLE" not in df.columns:
+        # Si no existe, creamos una dummy o avisamos? T_1 depende de esto.
+        # Intentamos ser flexibles:
+        df["COORDINADORA RESPONSABLE"] = "SIN ASIGNAR"
+
+    # 4. Procesar Fechas
+    with load_profiler.etapa("fechas", len(df)) as etapa:
+        df["DIAS/FECHAS"] = convertir_fechas_uai(df["DIAS/FECHAS"])
         df = df.dropna(subset=["DIAS/FECHAS"])
-        
+
         # 5. Columnas Calculadas
         df['Dia_Semana'] = df['DIAS/FECHAS'].dt.day_name().map(DIAS_SEMANA_MAP)
         df['Mes'] = df['DIAS/FECHAS'].dt.month.map(MESES_NOMBRE)
-        
+        etapa["Filas Salida"] = len(df)
+
+    with load_profiler.etapa("textos", len(df)) as etapa:
         # Normalizar textos
         for col in ["COORDINADORA RESPONSABLE", "PROGRAMA", "SEDE", "PROFESOR"]:
             if col in df.columns:
@@ -142,80 +449,147 @@ def load_data(file):
             if 'ONLINE' in s or 'ZOOM' in s: return 'Online'
             if 'HIBRID' in s or 'HÍBRID' in s: return 'Híbrida'
             return 'Presencial'
-        
+
         df['Modalidad_Calc'] = df['SEDE'].apply(get_modalidad)
-        
-        # Intentar extraer horas si existen (para validaciones)
-        # Buscamos columnas de hora por posición relativa a fecha o por nombre
+        etapa["Filas Salida"] = len(df)
+
+    with load_profiler.etapa("horas", len(df)) as etapa:
+        # 6. Horas (una sola pasada): inicio/fin como minutos desde medianoche
+        # Buscamos columnas de hora por nombre o por posición relativa a la fecha
         col_h_inicio = find_col(["HORA INICIO", "INICIO", "DESDE"])
         col_h_fin = find_col(["HORA FIN", "FIN", "HASTA"])
-        
+
+        s_ini = s_fin = None
         if col_h_inicio and col_h_fin:
-             # Convertir a string para evitar ArrowTypeError en Streamlit
-             df["HORA_INICIO"] = pd.to_datetime(df[col_h_inicio].astype(str), errors='coerce').dt.time.astype(str)
-             df["HORA_FIN"] = pd.to_datetime(df[col_h_fin].astype(str), errors='coerce').dt.time.astype(str)
-             
-             # Crear columna HORARIO si no existe, como string
-             if "HORARIO" not in df.columns:
-                 df["HORARIO"] = df["HORA_INICIO"] + " - " + df["HORA_FIN"]
+            s_ini, s_fin = df[col_h_inicio], df[col_h_fin]
         else:
-            # Intentar por posición (asumiendo Fecha + 1 y Fecha + 2 como en app.extr.py)
-            try:
-                idx_fecha = df.columns.get_loc("DIAS/FECHAS")
-                if idx_fecha + 2 < len(df.columns):
-                    df["HORA_INICIO"] = pd.to_datetime(df.iloc[:, idx_fecha+1].astype(str), errors='coerce').dt.time.astype(str)
-                    df["HORA_FIN"] = pd.to_datetime(df.iloc[:, idx_fecha+2].astype(str), errors='coerce').dt.time.astype(str)
-                    if "HORARIO" not in df.columns:
-                         df["HORARIO"] = df["HORA_INICIO"] + " - " + df["HORA_FIN"]
-            except:
-                pass
-        
-        # Asegurar que HORARIO sea string si existe
+            # Asumiendo Fecha + 1 y Fecha + 2 como en app.extr.py
+            idx_fecha = df.columns.get_loc("DIAS/FECHAS")
+            if isinstance(idx_fecha, int) and idx_fecha + 2 < len(df.columns):
+                s_ini, s_fin = df.iloc[:, idx_fecha + 1], df.iloc[:, idx_fecha + 2]
+
+        if s_ini is not None:
+            df["HORA_INICIO_MIN"] = minutos_desde_medianoche(s_ini)
+            df["HORA_FIN_MIN"] = minutos_desde_medianoche(s_fin)
+
+            # Crear columna HORARIO si no existe (texto solo para mostrar)
+            if "HORARIO" not in df.columns:
+                df["HORARIO"] = (formatear_minutos(df["HORA_INICIO_MIN"], FORMATO_HORA, "NaT") + " - "
+                                 + formatear_minutos(df["HORA_FIN_MIN"], FORMATO_HORA, "NaT"))
+
+            # Duración en horas; nulos o negativos quedan en 0
+            duracion = (df["HORA_FIN_MIN"] - df["HORA_INICIO_MIN"]).astype("float64") / 60.0
+            df["Duracion_Horas"] = duracion.fillna(0).clip(lower=0)
+        else:
+            df["Duracion_Horas"] = 0.0
+
+        # Asegurar que HORARIO sea string si existe (evita ArrowTypeError en Streamlit)
         if "HORARIO" in df.columns:
             df["HORARIO"] = df["HORARIO"].astype(str)
+        etapa["Filas Salida"] = len(df)
 
-        # 6. Calcular Duración en Horas
-        # Necesitamos objetos datetime/timedelta para restar
-        try:
-            # Convertir a datetime completo (usando fecha dummy) para poder restar
-            # Asumimos que HORA_INICIO y FIN están en formato HH:MM o HH:MM:SS
-            def to_td(h_str):
-                try:
-                    return pd.to_datetime(str(h_str), format="%H:%M:%S").time()
-                except:
-                    try: 
-                        return pd.to_datetime(str(h_str), format="%H:%M").time()
-                    except:
-                        return None
-
-            # Vectorizado es más rápido, pero con formatos mixtos es difícil.
-            # Usaremos pd.to_datetime con errors='coerce' sobre strings limpios
-            
-            # Asegurar formato HH:MM:SS para facilitar
-            s_ini = pd.to_datetime(df["HORA_INICIO"], format='%H:%M:%S', errors='coerce')
-            s_fin = pd.to_datetime(df["HORA_FIN"], format='%H:%M:%S', errors='coerce')
-            
-            # Si falló, intentar inferir
-            if s_ini.isna().all():
-                 s_ini = pd.to_datetime(df["HORA_INICIO"], errors='coerce')
-            if s_fin.isna().all():
-                 s_fin = pd.to_datetime(df["HORA_FIN"], errors='coerce')
+    return df
 
-            df["Duracion_Horas"] = (s_fin - s_ini).dt.total_seconds() / 3600.0
-            
-            # Limpiar negativos o nulos
-            df["Duracion_Horas"] = df["Duracion_Horas"].fillna(0)
-            df.loc[df["Duracion_Horas"] < 0, "Duracion_Horas"] = 0
-            
-        except Exception as e:
-            # Si falla el cálculo, dejar en 0 para no romper
-            df["Duracion_Horas"] = 0.0
-            print(f"Warning: No se pudo calcular duración: {e}")
+# --- TIPOS COMPACTOS ---
+def compactar_tipos(df):
+    """
+    Convierte las columnas de baja cardinalidad a category (Dia_Semana y Mes con
+    sus categorías en orden de calendario). Los filtros isin/groupby/unique
+    pasan a operar sobre códigos enteros en vez de hashear strings.
+    """
+    with load_profiler.etapa("tipos", len(df)) as etapa:
+        for col in COLUMNAS_CATEGORICAS:
+            if col in df.columns:
+                df[col] = df[col].astype("category")
+        if "Dia_Semana" in df.columns:
+            df["Dia_Semana"] = pd.Categorical(df["Dia_Semana"], categories=DIAS_ORDEN)
+        if "Mes" in df.columns:
+            df["Mes"] = pd.Categorical(df["Mes"], categories=list(MESES_NOMBRE.values()))
+        etapa["Filas Salida"] = len(df)
+    return df
 
-        return df
-    except Exception as e:
-        # Re-lanzar la excepción para que sea manejada por la app principal
-        raise Exception(f"Error en utils.load_data: {str(e)}")
+def reporte_memoria(df_antes, df_despues):
+    """Compara el uso de memoria (MB, deep=True) por columna entre dos versiones del DataFrame."""
+    antes = df_antes.memory_usage(deep=True, index=False) / (1024 * 1024)
+    despues = df_despues.memory_usage(deep=True, index=False) / (1024 * 1024)
+    reporte = pd.DataFrame({"MB_Antes": antes, "MB_Despues": despues}).fillna(0)
+    reporte.loc["TOTAL"] = reporte.sum()
+    reporte["Ahorro_%"] = (100 * (1 - reporte["MB_Despues"] / reporte["MB_Antes"])).round(1)
+    return reporte.round(3)
+
+# --- AGREGACIONES ---
+def unir_distintos(df, claves, columna, sep=", "):
+    """
+    Valores distintos de `columna` por grupo, ordenados y unidos con `sep`.
+    Equivale a groupby(claves)[columna].apply(lambda x: sep.join(sorted(x.dropna().unique())))
+    pero deduplica y ordena una sola vez sobre códigos enteros.
+    Retorna una Serie indexada por las claves del grupo.
+    """
+    if isinstance(claves, str):
+        claves = [claves]
+    sub = df[claves + [columna]].dropna(subset=[columna])
+    g = sub.groupby(claves, observed=True, sort=True)
+    grupo = g.ngroup().to_numpy()
+    codigos, uniques = pd.factorize(sub[columna])
+    if len(codigos) == 0:
+        return pd.Series(dtype=object, name=columna)
+
+    # Rango de cada valor en el orden de sorted(), así se ordena con enteros
+    uniques = list(uniques)
+    orden = sorted(range(len(uniques)), key=uniques.__getitem__)
+    rango = np.empty(len(uniques), dtype="int64")
+    rango[orden] = np.arange(len(uniques))
+    valores = np.array([uniques[i] for i in orden], dtype=object)
+
+    # Par (grupo, valor) en un solo entero: np.unique deduplica y ordena a la vez
+    validos = grupo >= 0
+    par = np.unique(grupo[validos].astype("int64") * len(uniques) + rango[codigos[validos]])
+    grupos_u, valores_u = np.divmod(par, len(uniques))
+
+    cortes = np.flatnonzero(np.diff(grupos_u)) + 1
+    textos = [sep.join(p) for p in np.split(valores[valores_u], cortes)]
+    indice = g.size().index[grupos_u[np.r_[0, cortes]]]
+    return pd.Series(textos, index=indice, name=columna, dtype=object)
+
+# --- REGLAS DE CARGA Y AVANCE ---
+# Umbrales de Factor Alumnos: n < umbral -> factor (0 o "Por definir" cuenta como 1.0)
+UMBRALES_ALUMNOS = [(20, 1.0), (30, 1.2), (40, 1.4), (49, 1.7)]
+FACTOR_ALUMNOS_MAX = 2.0
+
+def get_factor_alumnos(n):
+    """Versión escalar (referencia) del Factor Alumnos."""
+    if n == 0: return 1.0 # Default si es 0 o Por definir
+    for umbral, factor in UMBRALES_ALUMNOS:
+        if n < umbral: return factor
+    return FACTOR_ALUMNOS_MAX
+
+def factor_alumnos(alumnos) -> np.ndarray:
+    """Factor Alumnos vectorizado (np.select sobre los mismos umbrales). NaN -> 2.0, igual que la escalar."""
+    n = np.asarray(alumnos, dtype="float64")
+    condiciones = [n == 0] + [n < umbral for umbral, _ in UMBRALES_ALUMNOS]
+    valores = [1.0] + [factor for _, factor in UMBRALES_ALUMNOS]
+    return np.select(condiciones, valores, default=FACTOR_ALUMNOS_MAX)
+
+def get_avance(inicio, fin, hoy):
+    """Versión escalar (referencia) del % de avance temporal de un programa."""
+    if pd.isna(inicio) or pd.isna(fin): return 0
+    total = (fin - inicio).days
+    if total <= 0: return 100
+    elapsed = (hoy - inicio).days
+    return 100 if elapsed >= total else max(0, int((elapsed/total)*100))
+
+def porcentaje_avance(inicio: pd.Series, fin: pd.Series, hoy) -> pd.Series:
+    """% de avance temporal vectorizado: aritmética de fechas + np.select."""
+    total = (fin - inicio).dt.days.to_numpy(dtype="float64")
+    elapsed = (pd.Timestamp(hoy) - inicio).dt.days.to_numpy(dtype="float64")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        parcial = np.maximum(0, np.trunc((elapsed / total) * 100))
+    avance = np.select(
+        [inicio.isna().to_numpy() | fin.isna().to_numpy(), total <= 0, elapsed >= total],
+        [0, 100, 100],
+        default=parcial,
+    )
+    return pd.Series(avance.astype("int64"), index=inicio.index)
 
 # --- FILTROS ---
 def reset_filters():
@@ -228,65 +602,130 @@ def render_filters(df, prefix="t1"):
     """
     Renderiza filtros comunes y retorna el dataframe filtrado.
     """
+    idx = filter_index.indice_filtros(df)
+
     with st.expander("🔍 Filtros", expanded=True):
         col1, col2, col3 = st.columns(3)
         
         # Año
         with col1:
-            years = sorted(df['DIAS/FECHAS'].dt.year.unique())
+            years = idx.opciones("Año")
             sel_year = st.multiselect("Año", years, default=years, key=f"{prefix}_year")
             
         # Coordinadora
         with col2:
-            coords = sorted(df['COORDINADORA RESPONSABLE'].unique())
+            coords = idx.opciones("COORDINADORA RESPONSABLE")
             sel_coord = st.multiselect("Coordinadora", coords, key=f"{prefix}_coord")
             
         # Programa
         with col3:
             # Filtrar programas según coord seleccionada si aplica
-            if sel_coord:
-                progs = sorted(df[df['COORDINADORA RESPONSABLE'].isin(sel_coord)]['PROGRAMA'].unique())
-            else:
-                progs = sorted(df['PROGRAMA'].unique())
+            progs = idx.opciones("PROGRAMA", idx.aplicar(None, "COORDINADORA RESPONSABLE", sel_coord))
             sel_prog = st.multiselect("Programa", progs, key=f"{prefix}_prog")
             
         col4, col5, col6 = st.columns(3)
         
         # Modalidad
         with col4:
-            mods = sorted(df['Modalidad_Calc'].unique())
+            mods = idx.opciones("Modalidad_Calc")
             sel_mod = st.multiselect("Modalidad", mods, key=f"{prefix}_mod")
             
         # Sede
         with col5:
-            sedes = sorted(df['SEDE'].unique())
+            sedes = idx.opciones("SEDE")
             sel_sede = st.multiselect("Sede", sedes, key=f"{prefix}_sede")
             
         # Día
         with col6:
             dias = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"]
-            avail_dias = sorted([d for d in dias if d in df['Dia_Semana'].unique()], key=lambda x: dias.index(x))
+            avail_dias = sorted([d for d in dias if d in idx.opciones("Dia_Semana")], key=lambda x: dias.index(x))
             sel_dia = st.multiselect("Día", avail_dias, key=f"{prefix}_dia")
         
-    # Aplicar filtros
-    mask = pd.Series(True, index=df.index)
-    if sel_year: mask &= df['DIAS/FECHAS'].dt.year.isin(sel_year)
-    if sel_coord: mask &= df['COORDINADORA RESPONSABLE'].isin(sel_coord)
-    if sel_prog: mask &= df['PROGRAMA'].isin(sel_prog)
-    if sel_mod: mask &= df['Modalidad_Calc'].isin(sel_mod)
-    if sel_sede: mask &= df['SEDE'].isin(sel_sede)
-    if sel_dia: mask &= df['Dia_Semana'].isin(sel_dia)
-    
-    return df[mask]
+    # Aplicar filtros (AND de máscaras precalculadas)
+    return idx.filtrar(df, {
+        "Año": sel_year, "COORDINADORA RESPONSABLE": sel_coord, "PROGRAMA": sel_prog,
+        "Modalidad_Calc": sel_mod, "SEDE": sel_sede, "Dia_Semana": sel_dia
+    })
+
+# --- NAVEGACIÓN ---
+# Pestañas perezosas: cada rerun ejecuta solo la pestaña seleccionada.
+# GESTOR_PESTANAS_PEREZOSAS=0 vuelve a ejecutar las siete en cada rerun.
+PESTANAS_PEREZOSAS = os.environ.get("GESTOR_PESTANAS_PEREZOSAS", "1").strip().lower() not in ("0", "false", "no")
+# Los widgets de una pestaña oculta no se dibujan: sin persistir perderían su valor
+PERSISTIR_WIDGETS = "session" if PESTANAS_PEREZOSAS else None
+
+def pestanas(etiquetas: list, key: str = "seccion"):
+    """st.tabs que, en modo perezoso, hace rerun al cambiar de pestaña y expone .open."""
+    return st.tabs(etiquetas, key=key, on_change="rerun" if PESTANAS_PEREZOSAS else "ignore")
+
+def pestana_activa(tab) -> bool:
+    """True si la pestaña está seleccionada. Sin modo perezoso .open es None: todas corren."""
+    return tab.open is not False
 
 # --- EXPORTAR ---
+# Filas que se convierten a valores de Python por vez al escribir una hoja
+EXCEL_FILAS_POR_BLOQUE = 50_000
+
+def _filas_excel(df: pd.DataFrame):
+    """Filas del DataFrame como tuplas de valores de Python, por bloques (nulos -> celda vacía)."""
+    for inicio in range(0, len(df), EXCEL_FILAS_POR_BLOQUE):
+        bloque = df.iloc[inicio:inicio + EXCEL_FILAS_POR_BLOQUE]
+        columnas = [
+            bloque.iloc[:, i].astype(object).where(bloque.iloc[:, i].notna(), None).tolist()
+            for i in range(bloque.shape[1])
+        ]
+        yield from zip(*columnas)
+
+def escribir_excel(hojas: dict) -> bytes:
+    """
+    Escribe {nombre de hoja: DataFrame} en un libro xlsx con el modo write-only
+    de openpyxl: las filas se vuelcan al archivo a medida que se agregan, sin
+    armar el libro completo en memoria. Los valores pueden ser callables que
+    retornan el DataFrame (se evalúan recién al escribir esa hoja).
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+
+    libro = Workbook(write_only=True)
+    negrita = Font(bold=True)
+    for nombre, df in hojas.items():
+        if callable(df):
+            df = df()
+        if df is None:
+            continue
+        hoja = libro.create_sheet(title=str(nombre)[:31])
+        encabezado = []
+        for col in df.columns:
+            celda = WriteOnlyCell(hoja, value=str(col))
+            celda.font = negrita
+            encabezado.append(celda)
+        hoja.append(encabezado)
+        for fila in _filas_excel(df):
+            hoja.append(fila)
+
+    # Temporal en disco en vez de BytesIO: el zip no queda dos veces en memoria
+    with tempfile.TemporaryFile() as salida:
+        libro.save(salida)
+        salida.seek(0)
+        return salida.read()
+
+def datos_exportables(df):
+    """
+    Hoja Datos_Completos: HORA_INICIO_MIN/HORA_FIN_MIN vuelven a ser las columnas
+    de texto HORA_INICIO/HORA_FIN ("HH:MM:SS", "NaT" sin hora) en la misma posición.
+    """
+    minutos = {"HORA_INICIO_MIN": "HORA_INICIO", "HORA_FIN_MIN": "HORA_FIN"}
+    if not all(c in df.columns for c in minutos):
+        return df
+    textos = {c: formatear_minutos(df[c], FORMATO_HORA, "NaT") for c in minutos}
+    return df.assign(**textos).rename(columns=minutos)
+
 def generate_excel_report(df):
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, index=False, sheet_name='Datos_Completos')
-        
+    return escribir_excel({
+        "Datos_Completos": lambda: datos_exportables(df),
         # Resumen por coord
-        resumen = df.groupby('COORDINADORA RESPONSABLE').size().reset_index(name='Total Clases')
-        resumen.to_excel(writer, index=False, sheet_name='Resumen_Coordinadoras')
-        
-    return output.getvalue()
+        "Resumen_Coordinadoras": lambda: df.groupby(
+            'COORDINADORA RESPONSABLE', observed=True
+        ).size().reset_index(name='Total Clases'),
+    })
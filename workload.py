@@ -0,0 +1,266 @@
+import pandas as pd
+
+import utils
+
+# --- CONSTANTES ---
+COL_COORD = "COORDINADORA RESPONSABLE"
+COL_PROG = "PROGRAMA"
+# Sesiones que equivalen a 1 punto de Factor Sesiones
+SESIONES_POR_PUNTO = 4
+
+
+# --- REGLAS DE NEGOCIO ---
+def puntaje_programas(df: pd.DataFrame, claves: list, col_alumnos: str) -> pd.DataFrame:
+    """Sesiones, Alumnos (máx), factores y Puntaje agrupando por `claves`."""
+    tabla = df.groupby(claves, observed=True).agg(
+        Sesiones=("DIAS/FECHAS", "count"),
+        Alumnos=(col_alumnos, "max")
+    ).reset_index()
+    tabla["Factor_Sesiones"] = tabla["Sesiones"] / SESIONES_POR_PUNTO
+    tabla["Factor_Alumnos"] = utils.factor_alumnos(tabla["Alumnos"])
+    tabla["Puntaje"] = tabla["Factor_Sesiones"] * tabla["Factor_Alumnos"]
+    return tabla
+
+
+# --- MODELO INCREMENTAL ---
+class ModeloCarga:
+    """
+    Carga laboral (Puntaje) precalculada una vez por selección de datos.
+    Reasignar un programa no toca las filas: resta los aportes que el programa
+    tenía en sus coordinadoras actuales y suma su puntaje unificado a la nueva.
+    """
+
+    def __init__(self, df_carga: pd.DataFrame, col_alumnos: str):
+        # Puntaje por (Coordinadora, Programa): tabla "real" del tab Gestión
+        self.pares = puntaje_programas(df_carga, [COL_COORD, COL_PROG], col_alumnos)
+
+        # Puntaje del programa completo si queda con una sola coordinadora
+        por_programa = puntaje_programas(df_carga, [COL_PROG], col_alumnos)
+        self.puntaje_programa = dict(zip(por_programa[COL_PROG], por_programa["Puntaje"]))
+
+        # Aportes actuales de cada programa: {programa: [(coord, puntaje), ...]}
+        self.aportes = {}
+        for coord, prog, puntaje in zip(self.pares[COL_COORD], self.pares[COL_PROG], self.pares["Puntaje"]):
+            self.aportes.setdefault(prog, []).append((coord, puntaje))
+
+        # Coordinadora de la primera fila de cada programa (la que muestra el simulador)
+        primeras = df_carga.drop_duplicates(COL_PROG)
+        self.coord_inicial = dict(zip(primeras[COL_PROG], primeras[COL_COORD]))
+
+        agrupado = self.pares.groupby(COL_COORD, observed=True)["Puntaje"]
+        self.puntaje_base = agrupado.sum().to_dict()
+        self.programas_base = agrupado.size().to_dict()
+
+    def resumen(self) -> pd.DataFrame:
+        """Puntaje total por coordinadora, de mayor a menor."""
+        resumen = self.pares.groupby(COL_COORD, observed=True)["Puntaje"].sum().reset_index()
+        return resumen.sort_values("Puntaje", ascending=False)
+
+    def coordinadora_actual(self, programa, cambios: dict = None):
+        """Coordinadora del programa, considerando la simulación si la hay."""
+        if cambios and programa in cambios:
+            return cambios[programa]
+        return self.coord_inicial.get(programa)
+
+    def delta(self, programa, nueva_coord) -> dict:
+        """Cambio de puntaje por coordinadora al mover el programa completo a nueva_coord."""
+        cambios = {}
+        for coord, puntaje in self.aportes.get(programa, []):
+            cambios[coord] = cambios.get(coord, 0.0) - puntaje
+        if programa in self.puntaje_programa:
+            cambios[nueva_coord] = cambios.get(nueva_coord, 0.0) + self.puntaje_programa[programa]
+        return cambios
+
+    def simular(self, cambios: dict) -> dict:
+        """
+        Puntaje por coordinadora aplicando {programa: nueva_coord}.
+        Costo proporcional a la cantidad de cambios, no al tamaño del archivo.
+        Las coordinadoras que quedan sin programas no aparecen.
+        """
+        puntajes = dict(self.puntaje_base)
+        n_programas = dict(self.programas_base)
+        tocadas = set()
+        for prog, nueva in cambios.items():
+            if prog not in self.aportes:
+                continue # Programa fuera de la selección actual
+            for coord, puntaje in self.aportes[prog]:
+                puntajes[coord] -= puntaje
+                n_programas[coord] -= 1
+                tocadas.add(coord)
+            puntajes[nueva] = puntajes.get(nueva, 0.0) + self.puntaje_programa[prog]
+            n_programas[nueva] = n_programas.get(nueva, 0) + 1
+            tocadas.add(nueva)
+        # Redondeo solo donde hubo restas, para no arrastrar ruido de punto flotante
+        return {
+            c: (round(p, 9) if c in tocadas else p)
+            for c, p in puntajes.items() if n_programas[c] > 0
+        }
+
+    def comparativa(self, cambios: dict) -> pd.DataFrame:
+        """Tabla Real vs Simulado por coordinadora, como la del simulador."""
+        actual = pd.Series(self.puntaje_base, name="Puntaje_Actual", dtype=float)
+        simulado = pd.Series(self.simular(cambios), name="Puntaje_Simulado", dtype=float)
+        comparativa = pd.concat([actual, simulado], axis=1).fillna(0)
+        comparativa.index = comparativa.index.astype(object)
+        comparativa = comparativa.sort_index().rename_axis(COL_COORD).reset_index()
+
+        comparativa["Diferencia"] = comparativa["Puntaje_Simulado"] - comparativa["Puntaje_Actual"]
+        return comparativa.sort_values("Puntaje_Simulado", ascending=False)
+
+
+def modelo_carga(df_carga: pd.DataFrame, col_alumnos: str) -> ModeloCarga:
+    """Constructor con la firma func(df, *args) que usa agg_cache.memo."""
+    return ModeloCarga(df_carga, col_alumnos)
+
+
+# --- OPTIMIZADOR DE BALANCE ---
+# Coordinadoras más/menos cargadas que se exploran en cada paso de la búsqueda local
+CANDIDATAS_ORIGEN = 3
+CANDIDATAS_DESTINO = 5
+
+class _EstadoBalance:
+    """Asignación en curso del optimizador: puntajes y días ocupados por coordinadora."""
+
+    def __init__(self, modelo: ModeloCarga, df_carga: pd.DataFrame, coordinadoras):
+        self.modelo = modelo
+        self.puntajes = {c: modelo.puntaje_base.get(c, 0.0) for c in coordinadoras}
+        self.cambios = {}
+        # Coordinadoras que hoy tienen sesiones de cada programa
+        self.duenas = {p: [c for c, _ in aportes] for p, aportes in modelo.aportes.items()}
+
+        # Días (fechas) de cada par (coordinadora, programa) y ocupación por día
+        sesiones = df_carga[[COL_COORD, COL_PROG, "DIAS/FECHAS"]].drop_duplicates()
+        self.dias_par = {}
+        for (coord, prog), fechas in sesiones.groupby([COL_COORD, COL_PROG], observed=True)["DIAS/FECHAS"]:
+            self.dias_par[(coord, prog)] = set(fechas)
+        self.dias_programa = {}
+        for (_, prog), fechas in self.dias_par.items():
+            self.dias_programa.setdefault(prog, set()).update(fechas)
+        self.ocupacion = {c: {} for c in coordinadoras}
+        for (coord, _), fechas in self.dias_par.items():
+            dias = self.ocupacion.setdefault(coord, {})
+            for f in fechas:
+                dias[f] = dias.get(f, 0) + 1
+
+    def delta(self, prog, destino) -> dict:
+        if prog in self.cambios:
+            peso = self.modelo.puntaje_programa[prog]
+            return {self.cambios[prog]: -peso, destino: peso}
+        return self.modelo.delta(prog, destino)
+
+    def costo(self, delta: dict) -> float:
+        # Variación de la suma de cuadrados: menor = puntajes más parejos
+        return sum(2 * self.puntajes.get(c, 0.0) * d + d * d for c, d in delta.items())
+
+    def cabe(self, prog, destino, max_progs_dia) -> bool:
+        if not max_progs_dia:
+            return True
+        ocupados = self.ocupacion.get(destino, {})
+        ya_tiene = self.dias_par.get((destino, prog), set())
+        return all(
+            ocupados.get(f, 0) + (0 if f in ya_tiene else 1) <= max_progs_dia
+            for f in self.dias_programa.get(prog, ())
+        )
+
+    def mover(self, prog, destino):
+        for c, d in self.delta(prog, destino).items():
+            self.puntajes[c] = self.puntajes.get(c, 0.0) + d
+        for coord in self.duenas[prog]:
+            for f in self.dias_par.pop((coord, prog), ()):
+                self.ocupacion[coord][f] -= 1
+        fechas = self.dias_programa.get(prog, set())
+        self.dias_par[(destino, prog)] = set(fechas)
+        dias = self.ocupacion.setdefault(destino, {})
+        for f in fechas:
+            dias[f] = dias.get(f, 0) + 1
+        self.duenas[prog] = [destino]
+        self.cambios[prog] = destino
+
+
+def optimizar_balance(modelo: ModeloCarga, df_carga: pd.DataFrame, max_progs_dia: int = None,
+                      preferir_misma_sede: bool = False, fijos=(), max_movimientos: int = 50,
+                      desde_cero: bool = False, coordinadoras=None) -> pd.DataFrame:
+    """
+    Propone reasignaciones de programas que emparejan el Puntaje entre coordinadoras.
+
+    - desde_cero: reparte los programas no fijos con LPT (mayor puntaje primero,
+      a la coordinadora menos cargada); si no, parte de la asignación actual.
+    - Luego búsqueda local: mueve programas desde las coordinadoras más cargadas
+      a las menos cargadas mientras baje la suma de cuadrados de los puntajes.
+    - Restricciones: máx. programas distintos por día y coordinadora, programas
+      fijos, y preferencia por coordinadoras que ya trabajan en la sede del programa.
+
+    Retorna un DataFrame con una fila por movimiento (PROGRAMA, Desde, Hacia, Puntaje),
+    listo para volcar en sim_cambios.
+    """
+    coordinadoras = list(coordinadoras) if coordinadoras is not None else list(modelo.puntaje_base)
+    fijos = set(fijos)
+    estado = _EstadoBalance(modelo, df_carga, coordinadoras)
+    movibles = [p for p in modelo.puntaje_programa if p not in fijos]
+
+    # Sedes por programa y por coordinadora (según la asignación actual)
+    sedes_programa, sedes_coord = {}, {}
+    if preferir_misma_sede and "SEDE" in df_carga.columns:
+        pares_sede = df_carga[[COL_COORD, COL_PROG, "SEDE"]].drop_duplicates()
+        for coord, prog, sede in zip(pares_sede[COL_COORD], pares_sede[COL_PROG], pares_sede["SEDE"]):
+            sedes_programa.setdefault(prog, set()).add(sede)
+            sedes_coord.setdefault(coord, set()).add(sede)
+
+    def destinos_validos(prog, candidatas):
+        validas = [c for c in candidatas if estado.cabe(prog, c, max_progs_dia)]
+        if sedes_programa.get(prog):
+            misma_sede = [c for c in validas if sedes_coord.get(c, set()) & sedes_programa[prog]]
+            # Preferencia, no obligación: si ninguna comparte sede se usan todas
+            if misma_sede:
+                return misma_sede
+        return validas
+
+    # 1. Construcción LPT opcional: los fijos se quedan, el resto se reparte de mayor a menor
+    if desde_cero:
+        cargas = {c: 0.0 for c in coordinadoras}
+        for prog in fijos & set(modelo.aportes):
+            for coord, puntaje in modelo.aportes[prog]:
+                cargas[coord] = cargas.get(coord, 0.0) + puntaje
+        for prog in sorted(movibles, key=lambda p: -modelo.puntaje_programa[p]):
+            por_carga = sorted(coordinadoras, key=cargas.get)
+            destino = (destinos_validos(prog, por_carga) or estado.duenas[prog])[0]
+            cargas[destino] = cargas.get(destino, 0.0) + modelo.puntaje_programa[prog]
+            if estado.duenas[prog] != [destino]:
+                estado.mover(prog, destino)
+
+    # 2. Búsqueda local: el mejor movimiento de las más cargadas a las menos cargadas
+    movibles_set = set(movibles)
+    for _ in range(max_movimientos):
+        por_carga = sorted(coordinadoras, key=lambda c: estado.puntajes.get(c, 0.0))
+        origenes = por_carga[::-1][:CANDIDATAS_ORIGEN]
+        destinos = por_carga[:CANDIDATAS_DESTINO]
+
+        mejor, mejor_costo = None, -1e-9
+        for origen in origenes:
+            progs = [p for p, duenas in estado.duenas.items() if origen in duenas and p in movibles_set]
+            for prog in progs:
+                for destino in destinos_validos(prog, [d for d in destinos if d != origen]):
+                    costo = estado.costo(estado.delta(prog, destino))
+                    if costo < mejor_costo:
+                        mejor, mejor_costo = (prog, destino), costo
+        if mejor is None:
+            break
+        estado.mover(*mejor)
+
+    # Movimientos finales respecto de la asignación original
+    movimientos = []
+    for prog, destino in estado.cambios.items():
+        originales = [c for c, _ in modelo.aportes[prog]]
+        if originales == [destino]:
+            continue # Volvió a su coordinadora original
+        movimientos.append({
+            COL_PROG: prog,
+            "Desde": ", ".join(map(str, originales)),
+            "Hacia": destino,
+            "Puntaje": modelo.puntaje_programa[prog],
+        })
+    return pd.DataFrame(movimientos, columns=[COL_PROG, "Desde", "Hacia", "Puntaje"])
+
+def dispersion(puntajes: dict) -> float:
+    """Diferencia entre la coordinadora más y menos cargada."""
+    return max(puntajes.values()) - min(puntajes.values()) if puntajes else 0.0